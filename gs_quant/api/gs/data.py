@@ -532,6 +532,11 @@ class MarketDataResponseFrame(pd.DataFrame):
     _internal_names = pd.DataFrame._internal_names + ['dataset_ids']
     _internal_names_set = set(_internal_names)
 
+    def __init__(self, *args, dataset_ids: Optional[Tuple[str, ...]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if dataset_ids is not None:
+            self.dataset_ids = dataset_ids
+
     @property
     def _constructor(self):
         return MarketDataResponseFrame
@@ -19,7 +19,7 @@ import pandas as pd
 import pytest
 from pandas.util.testing import assert_frame_equal, assert_series_equal
 
-from gs_quant.api.gs.data import GsDataApi
+from gs_quant.api.gs.data import GsDataApi, MarketDataResponseFrame
 from gs_quant.context_base import ContextMeta
 from gs_quant.errors import MqValueError
 from gs_quant.markets import MarketDataCoordinate
@@ -307,5 +307,12 @@ def test_coordinates_converter():
         GsDataApi._coordinate_from_str("A")
 
 
+def test_market_data_response_frame_dataset_ids():
+    df = MarketDataResponseFrame({'a': [1, 2]}, dataset_ids=('A', 'B'))
+    assert df.dataset_ids == ('A', 'B')
+    assert list(df.columns) == ['a']
+    assert not hasattr(MarketDataResponseFrame({'a': [1, 2]}), 'dataset_ids')
+
+
 if __name__ == "__main__":
     pytest.main(args=["test_data.py"])
@@ -16,14 +16,17 @@ under the License.
 
 import datetime
 import datetime as dt
+import functools
+from collections import namedtuple
+from types import MappingProxyType
 from typing import Union
 
+import numpy as np
 import pandas as pd
 import pytest
 from numpy.testing import assert_allclose
 from pandas.testing import assert_series_equal
 from pytz import timezone
-from testfixtures import Replacer
 from testfixtures.mock import Mock
 
 import gs_quant.timeseries.measures as tm
@@ -38,17 +41,125 @@ from gs_quant.markets.securities import AssetClass, Cross, Index, Currency, Secu
 from gs_quant.session import GsSession, Environment
 from gs_quant.target.common import XRef, PricingLocation, Currency as CurrEnum
 from gs_quant.test.timeseries.utils import mock_request
-from gs_quant.timeseries.measures import BenchmarkType
+from gs_quant.timeseries.measures import BenchmarkType, PricingContext, SkewReference, skew, \
+    cross_stored_direction_for_fx_vol, cross_to_basis, cross_to_usd_based_cross, currency_to_default_benchmark_rate, \
+    currency_to_default_swap_rate_asset, currency_to_inflation_benchmark_rate
+from gs_quant.timeseries.measures_rates import _ClearingHouse, _check_clearing_house, \
+    _convert_asset_for_mdapi_swap_rates, _currency_to_mdapi_basis_swap_rate_asset, _currency_to_mdapi_swap_rate_asset, \
+    _get_swap_leg_defaults, check_forward_tenor
 from gs_quant.api.gs.data import QueryType
 
+pytestmark = pytest.mark.parallel_safe
+
 _index = [pd.Timestamp('2019-01-01')]
+_INDEX2 = pd.DatetimeIndex(_index * 2)
+_INDEX3 = pd.DatetimeIndex(_index * 3)
+_INDEX4 = pd.DatetimeIndex(_index * 4)
+_SINGLE_DATE_INDEX = pd.Index([dt.date(2019, 1, 2)])
+_SINGLE_DAY_CONTEXT = DataContext(dt.date(2019, 1, 2), dt.date(2019, 1, 2))
 _test_datasets = ('TEST_DATASET',)
 
+_FX_XREF_EURUSD = (GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EURUSD')),)
+_FX_XREF_JPYUSD = (GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='JPYUSD')),)
+_RATES_XREF_USD = (GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD')),)
+_RATES_XREF_GBP = (GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='GBP')),)
+_RATES_XREF_EUR = (GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EUR')),)
+
+_EXPECTED_512 = pd.Series([5, 1, 2], index=_INDEX3)
+_EXPECTED_FUNDAMENTAL = _EXPECTED_512.rename('fundamentalMetric')
+_EXPECTED_ESG_SCORE = pd.Series([2, 4, 6], index=_INDEX3)
+_EXPECTED_ESG_PERCENTILE = pd.Series([81.2, 75.4, 65.7], index=_INDEX3)
+_EXPECTED_ESG_DISCLOSURE = pd.Series([49.2, 55.7, 98.4], index=_INDEX3, name='esDisclosurePercentage')
+_EXPECTED_SKEW = pd.Series([2.0], index=_index, name='impliedVolatility')
+_EXPECTED_FORECAST = pd.Series([1.1, 1.1, 1.1], index=_INDEX3, name='forecast')
+_EXPECTED_VALUES = np.array([1, 2, 3], dtype=np.int64)
+_EXPECTED_TS_INDEX = pd.to_datetime(['2020-01-01', '2021-01-01', '2021-12-31', '2022-12-30'])
+_TERM_IDX_EXPIRATION = pd.DatetimeIndex(['2018-01-08', '2018-01-15', '2019-01-01', '2020-01-01'],
+                                        name='expirationDate')
+_TERM_IDX_VARSWAP = _TERM_IDX_EXPIRATION.rename('varSwap')
+_TERM_IDX_VARSWAP_FWD = pd.DatetimeIndex(['2018-02-02', '2018-03-02'], name='varSwap')
+
+
+def _expected(name: str) -> pd.Series:
+    return pd.Series(_EXPECTED_VALUES, index=_INDEX3, name=name, copy=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _qa_session():
+    return GsSession.get(Environment.QA, 'client_id', 'secret')
+
+
+@pytest.fixture(scope='session')
+def gs_qa_session():
+    return _qa_session()
+
+
+@pytest.fixture
+def patched_session(mocker, gs_qa_session):
+    mocker.patch.object(GsSession.__class__, 'default_value', return_value=gs_qa_session)
+    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
+    mocker.patch.object(GsSession.current, '_post', side_effect=mock_request)
+
+
+@pytest.fixture
+def market_data(monkeypatch):
+    # patches the class directly, skipping monkeypatch's resolution of a dotted import path on every call
+    return functools.partial(monkeypatch.setattr, GsDataApi, 'get_market_data')
+
+
+@pytest.fixture
+def single_day_context():
+    # one shared context for the commodity tests, which all price as of the same day
+    with _SINGLE_DAY_CONTEXT:
+        yield _SINGLE_DAY_CONTEXT
+
 
 def mock_empty_market_data_response():
-    df = MarketDataResponseFrame()
-    df.dataset_ids = ()
-    return df
+    return MarketDataResponseFrame(dataset_ids=())
+
+
+def _assert_eq(actual: pd.Series, values, index: pd.Index = _SINGLE_DATE_INDEX, name: str = 'price'):
+    # cheaper than assert_series_equal where only values, index and name matter; same relative tolerance
+    np.testing.assert_allclose(actual.to_numpy(dtype=float), values, rtol=1e-5)
+    assert actual.index.equals(index)
+    assert actual.name == name
+
+
+def _stub(return_value):
+    # plain function in place of Mock(return_value=...) where the calls are never inspected
+    return lambda *_args, **_kwargs: return_value
+
+
+_DEFAULT_RATE_MAP = {
+    "USD-LIBOR-BBA": "MAPDB7QNB2TZVQ0E",
+    "EUR-EURIBOR-TELERATE": "MAJNQPFGN1EBDHAE",
+    "GBP-LIBOR-BBA": "MAFYB8Z4R1377A19",
+    "JPY-LIBOR-BBA": "MABMVE27EM8YZK33",
+    "EUR OIS": "MARFAGXDQRWM07Y2",
+}
+
+_SWAP_RATE_MAP = {
+    "USD-3m": "MAAXGV0GZTW4GFNC",
+    "EUR-6m": "MA5WM2QWRVMYKDK0",
+    "KRW": "MAJ6SEQH3GT0GA2Z",
+}
+
+_INFLATION_MAP = {
+    "CPI-UKRPI": "MAQ7ND0MBP2AVVQW",
+    "CPI-CPXTEMU": "MAK1FHKH5P5GJSHH",
+}
+
+_CROSS_BASIS_MAP = {
+    "USD-3m/JPY-3m": "MA99N6C1KF9078NM",
+    "EUR-3m/USD-3m": "MAXPKTXW2D4X6MFQ",
+    "GBP-3m/USD-3m": "MA8BZHQV3W32V63B",
+}
+
+
+def _map_identifiers(mapping: dict, ids: IdList) -> dict:
+    for id_ in ids:
+        if id_ in mapping:
+            return {id_: mapping[id_]}
 
 
 def map_identifiers_default_mocker(input_type: Union[GsIdType, str],
@@ -59,16 +170,7 @@ def map_identifiers_default_mocker(input_type: Union[GsIdType, str],
                                    limit: int = None,
                                    **kwargs
                                    ) -> dict:
-    if "USD-LIBOR-BBA" in ids:
-        return {"USD-LIBOR-BBA": "MAPDB7QNB2TZVQ0E"}
-    elif "EUR-EURIBOR-TELERATE" in ids:
-        return {"EUR-EURIBOR-TELERATE": "MAJNQPFGN1EBDHAE"}
-    elif "GBP-LIBOR-BBA" in ids:
-        return {"GBP-LIBOR-BBA": "MAFYB8Z4R1377A19"}
-    elif "JPY-LIBOR-BBA" in ids:
-        return {"JPY-LIBOR-BBA": "MABMVE27EM8YZK33"}
-    elif "EUR OIS" in ids:
-        return {"EUR OIS": "MARFAGXDQRWM07Y2"}
+    return _map_identifiers(_DEFAULT_RATE_MAP, ids)
 
 
 def map_identifiers_swap_rate_mocker(input_type: Union[GsIdType, str],
@@ -79,12 +181,7 @@ def map_identifiers_swap_rate_mocker(input_type: Union[GsIdType, str],
                                      limit: int = None,
                                      **kwargs
                                      ) -> dict:
-    if "USD-3m" in ids:
-        return {"USD-3m": "MAAXGV0GZTW4GFNC"}
-    elif "EUR-6m" in ids:
-        return {"EUR-6m": "MA5WM2QWRVMYKDK0"}
-    elif "KRW" in ids:
-        return {"KRW": 'MAJ6SEQH3GT0GA2Z'}
+    return _map_identifiers(_SWAP_RATE_MAP, ids)
 
 
 def map_identifiers_inflation_mocker(input_type: Union[GsIdType, str],
@@ -95,10 +192,7 @@ def map_identifiers_inflation_mocker(input_type: Union[GsIdType, str],
                                      limit: int = None,
                                      **kwargs
                                      ) -> dict:
-    if "CPI-UKRPI" in ids:
-        return {"CPI-UKRPI": "MAQ7ND0MBP2AVVQW"}
-    elif "CPI-CPXTEMU" in ids:
-        return {"CPI-CPXTEMU": "MAK1FHKH5P5GJSHH"}
+    return _map_identifiers(_INFLATION_MAP, ids)
 
 
 def map_identifiers_cross_basis_mocker(input_type: Union[GsIdType, str],
@@ -109,12 +203,7 @@ def map_identifiers_cross_basis_mocker(input_type: Union[GsIdType, str],
                                        limit: int = None,
                                        **kwargs
                                        ) -> dict:
-    if "USD-3m/JPY-3m" in ids:
-        return {"USD-3m/JPY-3m": "MA99N6C1KF9078NM"}
-    elif "EUR-3m/USD-3m" in ids:
-        return {"EUR-3m/USD-3m": "MAXPKTXW2D4X6MFQ"}
-    elif "GBP-3m/USD-3m" in ids:
-        return {"GBP-3m/USD-3m": "MA8BZHQV3W32V63B"}
+    return _map_identifiers(_CROSS_BASIS_MAP, ids)
 
 
 def get_data_policy_rate_expectation_mocker(
@@ -139,499 +228,393 @@ def test_parse_meeting_date(mocker):
     assert tm.parse_meeting_date('') == ''
     assert tm.parse_meeting_date('test') == ''
     assert tm.parse_meeting_date('2019-09-01') == dt.date(2019, 9, 1)
+    assert tm.parse_meeting_date('2019-09-01') is tm.parse_meeting_date('2019-09-01')
 
 
-def test_currency_to_default_benchmark_rate(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
+def test_currency_to_default_benchmark_rate(mocker, patched_session):
     mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_default_mocker)
 
     asset_id_list = ["MAZ7RWC904JYHYPS", "MAJNQPFGN1EBDHAE", "MA66CZBQJST05XKG", "MAK1FHKH5P5GJSHH", "MA4J1YB8XZP2BPT8",
                      "MA4B66MW5E27U8P32SB"]
     correct_mapping = ["MAPDB7QNB2TZVQ0E", "MAJNQPFGN1EBDHAE", "MAFYB8Z4R1377A19", "MABMVE27EM8YZK33",
                        "MA4J1YB8XZP2BPT8", "MA4B66MW5E27U8P32SB"]
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.currency_to_default_benchmark_rate(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    with PricingContext(dt.date.today()):
+        for asset_id, expected in zip(asset_id_list, correct_mapping):
+            assert currency_to_default_benchmark_rate(asset_id) == expected
 
 
-def test_currency_to_default_swap_rate_asset(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
+def test_currency_to_default_swap_rate_asset(mocker, patched_session):
     mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_swap_rate_mocker)
 
     asset_id_list = ['MAZ7RWC904JYHYPS', 'MAJNQPFGN1EBDHAE', 'MAJ6SEQH3GT0GA2Z']
     correct_mapping = ['MAAXGV0GZTW4GFNC', 'MA5WM2QWRVMYKDK0', 'MAJ6SEQH3GT0GA2Z']
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.currency_to_default_swap_rate_asset(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    with PricingContext(dt.date.today()):
+        for asset_id, expected in zip(asset_id_list, correct_mapping):
+            assert currency_to_default_swap_rate_asset(asset_id) == expected
 
 
-def test_currency_to_inflation_benchmark_rate(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
+def test_currency_to_inflation_benchmark_rate(mocker, patched_session):
     mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_inflation_mocker)
 
     asset_id_list = ["MA66CZBQJST05XKG", "MAK1FHKH5P5GJSHH", "MA4J1YB8XZP2BPT8"]
     correct_mapping = ["MAQ7ND0MBP2AVVQW", "MAK1FHKH5P5GJSHH", "MA4J1YB8XZP2BPT8"]
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.currency_to_inflation_benchmark_rate(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    with PricingContext(dt.date.today()):
+        for asset_id, expected in zip(asset_id_list, correct_mapping):
+            assert currency_to_inflation_benchmark_rate(asset_id) == expected
 
         # Test that the same id is returned when a TypeError is raised
         mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=TypeError('Test'))
-        assert tm.currency_to_inflation_benchmark_rate('MA66CZBQJST05XKG') == 'MA66CZBQJST05XKG'
+        assert currency_to_inflation_benchmark_rate('MA66CZBQJST05XKG') == 'MA66CZBQJST05XKG'
 
 
-def test_cross_to_basis(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
+def test_cross_to_basis(mocker, patched_session):
     mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_cross_basis_mocker)
 
     asset_id_list = ["MAYJPCVVF2RWXCES", "MA4B66MW5E27U8P32SB", "nobbid"]
     correct_mapping = ["MA99N6C1KF9078NM", "MA4B66MW5E27U8P32SB", "nobbid"]
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.cross_to_basis(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    with PricingContext(dt.date.today()):
+        for asset_id, expected in zip(asset_id_list, correct_mapping):
+            assert cross_to_basis(asset_id) == expected
 
         # Test that the same id is returned when a TypeError is raised
         mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=TypeError('Test'))
-        assert tm.cross_to_basis('MAYJPCVVF2RWXCES') == 'MAYJPCVVF2RWXCES'
+        assert cross_to_basis('MAYJPCVVF2RWXCES') == 'MAYJPCVVF2RWXCES'
 
 
-def test_currency_to_mdapi_swap_rate_asset(mocker):
-    replace = Replacer()
-    mocker.patch.object(GsSession.__class__, 'current',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
+@pytest.fixture
+def bbid_mock(mocker, gs_qa_session, monkeypatch):
+    mocker.patch.object(GsSession.__class__, 'current', return_value=gs_qa_session)
     mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
     mocker.patch.object(SecurityMaster, 'get_asset', side_effect=mock_request)
-    bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    with tm.PricingContext(dt.date.today()):
-        asset = Currency('MA890', 'NOK')
-        bbid_mock.return_value = 'NOK'
-        assert 'MA890' == tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        asset = Currency('MAZ7RWC904JYHYPS', 'USD')
-        bbid_mock.return_value = 'USD'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MAFRSWPAF5QPNTP2' == correct_id
-        bbid_mock.return_value = 'CHF'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MAW25BGQJH9P6DPT' == correct_id
-        bbid_mock.return_value = 'EUR'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MAA9MVX15AJNQCVG' == correct_id
-        bbid_mock.return_value = 'GBP'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MA6QCAP9B7ABS9HA' == correct_id
-        bbid_mock.return_value = 'JPY'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MAEE219J5ZP0ZKRK' == correct_id
-        bbid_mock.return_value = 'SEK'
-        correct_id = tm_rates._currency_to_mdapi_swap_rate_asset(asset)
-        assert 'MAETMVTPNP3199A5' == correct_id
-
-    replace.restore()
-
-
-def test_currency_to_mdapi_basis_swap_rate_asset(mocker):
-    replace = Replacer()
-    mocker.patch.object(GsSession.__class__, 'current',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
-    mocker.patch.object(SecurityMaster, 'get_asset', side_effect=mock_request)
-    bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    with tm.PricingContext(dt.date.today()):
-        asset = Currency('MA890', 'NOK')
-        bbid_mock.return_value = 'NOK'
-        assert 'MA890' == tm_rates._currency_to_mdapi_basis_swap_rate_asset(asset)
-        asset = Currency('MAZ7RWC904JYHYPS', 'USD')
-        bbid_mock.return_value = 'USD'
-        correct_id = tm_rates._currency_to_mdapi_basis_swap_rate_asset(asset)
-        assert 'MAQB1PGEJFCET3GG' == correct_id
-        bbid_mock.return_value = 'EUR'
-        correct_id = tm_rates._currency_to_mdapi_basis_swap_rate_asset(asset)
-        assert 'MAGRG2VT11GQ2RQ9' == correct_id
-        bbid_mock.return_value = 'GBP'
-        correct_id = tm_rates._currency_to_mdapi_basis_swap_rate_asset(asset)
-        assert 'MAHCYNB3V75JC5Q8' == correct_id
-        bbid_mock.return_value = 'JPY'
-        correct_id = tm_rates._currency_to_mdapi_basis_swap_rate_asset(asset)
-        assert 'MAXVRBEZCJVH0C4V' == correct_id
-    replace.restore()
-
-
-def test_check_clearing_house(mocker):
-    assert tm_rates._ClearingHouse.CME == tm_rates._check_clearing_house(tm_rates._ClearingHouse.CME)
-    assert tm_rates._ClearingHouse.LCH == tm_rates._check_clearing_house(None)
-    invalid_ch = ['NYSE']
-    for ch in invalid_ch:
-        with pytest.raises(MqError):
-            tm_rates._check_clearing_house(ch)
-
-
-def test_cross_stored_direction_for_fx_vol(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
-    mocker.patch.object(GsSession.current, '_post', side_effect=mock_request)
-    asset_id_list = ["MAYJPCVVF2RWXCES", "MATGYV0J9MPX534Z"]
-    correct_mapping = ["MATGYV0J9MPX534Z", "MATGYV0J9MPX534Z"]
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.cross_stored_direction_for_fx_vol(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    bbid = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', bbid)
+    return bbid
+
+
+@pytest.mark.parametrize('asset_id, bbid, expected', [
+    ('MA890', 'NOK', 'MA890'),
+    ('MAZ7RWC904JYHYPS', 'USD', 'MAFRSWPAF5QPNTP2'),
+    ('MAZ7RWC904JYHYPS', 'CHF', 'MAW25BGQJH9P6DPT'),
+    ('MAZ7RWC904JYHYPS', 'EUR', 'MAA9MVX15AJNQCVG'),
+    ('MAZ7RWC904JYHYPS', 'GBP', 'MA6QCAP9B7ABS9HA'),
+    ('MAZ7RWC904JYHYPS', 'JPY', 'MAEE219J5ZP0ZKRK'),
+    ('MAZ7RWC904JYHYPS', 'SEK', 'MAETMVTPNP3199A5'),
+])
+def test_currency_to_mdapi_swap_rate_asset(bbid_mock, asset_id, bbid, expected):
+    bbid_mock.return_value = bbid
+    with PricingContext(dt.date.today()):
+        assert expected == _currency_to_mdapi_swap_rate_asset(Currency(asset_id, bbid))
+
+
+@pytest.mark.parametrize('asset_id, bbid, expected', [
+    ('MA890', 'NOK', 'MA890'),
+    ('MAZ7RWC904JYHYPS', 'USD', 'MAQB1PGEJFCET3GG'),
+    ('MAZ7RWC904JYHYPS', 'EUR', 'MAGRG2VT11GQ2RQ9'),
+    ('MAZ7RWC904JYHYPS', 'GBP', 'MAHCYNB3V75JC5Q8'),
+    ('MAZ7RWC904JYHYPS', 'JPY', 'MAXVRBEZCJVH0C4V'),
+])
+def test_currency_to_mdapi_basis_swap_rate_asset(bbid_mock, asset_id, bbid, expected):
+    bbid_mock.return_value = bbid
+    with PricingContext(dt.date.today()):
+        assert expected == _currency_to_mdapi_basis_swap_rate_asset(Currency(asset_id, bbid))
+
+
+@pytest.mark.parametrize('ch, expected', [(_ClearingHouse.CME, _ClearingHouse.CME), (None, _ClearingHouse.LCH)])
+def test_check_clearing_house(ch, expected):
+    assert expected == _check_clearing_house(ch)
+
+
+@pytest.mark.parametrize('ch', ['NYSE'])
+def test_check_clearing_house_invalid(ch):
+    with pytest.raises(MqError):
+        _check_clearing_house(ch)
 
 
-def test_cross_to_usd_based_cross_for_fx_forecast(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
-    mocker.patch.object(GsSession.current, '_post', side_effect=mock_request)
+@pytest.mark.parametrize('func', [cross_stored_direction_for_fx_vol, cross_to_usd_based_cross])
+def test_cross_direction_for_fx_measures(patched_session, func):
     asset_id_list = ["MAYJPCVVF2RWXCES", "MATGYV0J9MPX534Z"]
     correct_mapping = ["MATGYV0J9MPX534Z", "MATGYV0J9MPX534Z"]
-    with tm.PricingContext(dt.date.today()):
-        for i in range(len(asset_id_list)):
-            correct_id = tm.cross_to_usd_based_cross(asset_id_list[i])
-            assert correct_id == correct_mapping[i]
+    with PricingContext(dt.date.today()):
+        for asset_id, expected in zip(asset_id_list, correct_mapping):
+            assert func(asset_id) == expected
 
 
-def test_cross_to_used_based_cross(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
-    mocker.patch.object(GsSession.current, '_post', side_effect=mock_request)
+def test_cross_to_used_based_cross(mocker, patched_session, monkeypatch):
     mocker.patch.object(SecurityMaster, 'get_asset', side_effect=TypeError('unsupported'))
 
-    replace = Replacer()
-    bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    bbid_mock.return_value = 'HELLO'
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', _stub('HELLO'))
 
-    assert 'FUN' == tm.cross_to_usd_based_cross(Cross('FUN', 'EURUSD'))
-    replace.restore()
+    assert 'FUN' == cross_to_usd_based_cross(Cross('FUN', 'EURUSD'))
 
 
-def test_cross_stored_direction(mocker):
-    mocker.patch.object(GsSession.__class__, 'default_value',
-                        return_value=GsSession.get(Environment.QA, 'client_id', 'secret'))
-    mocker.patch.object(GsSession.current, '_get', side_effect=mock_request)
-    mocker.patch.object(GsSession.current, '_post', side_effect=mock_request)
+def test_cross_stored_direction(mocker, patched_session, monkeypatch):
     mocker.patch.object(SecurityMaster, 'get_asset', side_effect=TypeError('unsupported'))
 
-    replace = Replacer()
-    bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    bbid_mock.return_value = 'HELLO'
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', _stub('HELLO'))
 
-    assert 'FUN' == tm.cross_stored_direction_for_fx_vol(Cross('FUN', 'EURUSD'))
-    replace.restore()
+    assert 'FUN' == cross_stored_direction_for_fx_vol(Cross('FUN', 'EURUSD'))
 
 
-def test_convert_asset_for_mdapi_swap_rates():
-    mock_asset_1 = GsAsset(asset_class='Rate', id='MAW25BGQJH9P6DPT', type_='Swap', name='Test_asset')
-    mock_asset_2 = GsAsset(asset_class='Rate', id='MAA9MVX15AJNQCVG', type_='Swap', name='Test_asset')
+@pytest.mark.parametrize('bbid, expected', [
+    ('USDJPY', None),
+    ('EURGBP', None),
+    ('GBPUSD', None),
+    ('CHFJPY', None),
+    ('USDEUR', 'EURUSD'),
+    ('CADCHF', 'CHFCAD'),
+    ('KRWJPY', 'JPYKRW'),
+])
+def test_fx_vol_inverted_cross(bbid, expected):
+    assert tm._fx_vol_inverted_cross(bbid) == expected
 
-    replace = Replacer()
-    assets = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
-    assets.return_value = [mock_asset_1]
-    assert 'MAW25BGQJH9P6DPT' == tm_rates._convert_asset_for_mdapi_swap_rates()
-    replace.restore()
 
-    assets = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
-    assets.return_value = [mock_asset_1, mock_asset_2]
-    with pytest.raises(MqValueError):
-        tm_rates._convert_asset_for_mdapi_swap_rates()
-    replace.restore()
+_MDAPI_SWAP_ASSET_1 = GsAsset(asset_class='Rate', id='MAW25BGQJH9P6DPT', type_='Swap', name='Test_asset')
+_MDAPI_SWAP_ASSET_2 = GsAsset(asset_class='Rate', id='MAA9MVX15AJNQCVG', type_='Swap', name='Test_asset')
 
-    assets = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
-    assets.return_value = []
+
+def test_convert_asset_for_mdapi_swap_rates(monkeypatch):
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', _stub([_MDAPI_SWAP_ASSET_1]))
+    assert 'MAW25BGQJH9P6DPT' == _convert_asset_for_mdapi_swap_rates()
+
+
+@pytest.mark.parametrize('found', [[], [_MDAPI_SWAP_ASSET_1, _MDAPI_SWAP_ASSET_2]])
+def test_convert_asset_for_mdapi_swap_rates_not_unique(monkeypatch, found):
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', _stub(found))
     with pytest.raises(MqValueError):
-        tm_rates._convert_asset_for_mdapi_swap_rates()
-    replace.restore()
+        _convert_asset_for_mdapi_swap_rates()
 
 
 def test_get_swap_leg_defaults(mocker):
     result_dict = dict(currency=CurrEnum.JPY, benchmark_type='JPY-LIBOR-BBA', floating_rate_tenor='6m',
                        pricing_location=PricingLocation.TKO)
-    defaults = tm_rates._get_swap_leg_defaults(CurrEnum.JPY)
+    defaults = _get_swap_leg_defaults(CurrEnum.JPY)
     assert result_dict == defaults
 
     result_dict = dict(currency=CurrEnum.USD, benchmark_type='USD-LIBOR-BBA', floating_rate_tenor='3m',
                        pricing_location=PricingLocation.NYC)
-    defaults = tm_rates._get_swap_leg_defaults(CurrEnum.USD)
+    defaults = _get_swap_leg_defaults(CurrEnum.USD)
     assert result_dict == defaults
 
     result_dict = dict(currency=CurrEnum.EUR, benchmark_type='EUR-EURIBOR-Telerate', floating_rate_tenor='6m',
                        pricing_location=PricingLocation.LDN)
-    defaults = tm_rates._get_swap_leg_defaults(CurrEnum.EUR)
+    defaults = _get_swap_leg_defaults(CurrEnum.EUR)
     assert result_dict == defaults
 
     result_dict = dict(currency=CurrEnum.SEK, benchmark_type='SEK-STIBOR-SIDE', floating_rate_tenor='6m',
                        pricing_location=PricingLocation.LDN)
-    defaults = tm_rates._get_swap_leg_defaults(CurrEnum.SEK)
+    defaults = _get_swap_leg_defaults(CurrEnum.SEK)
     assert result_dict == defaults
 
 
-def test_check_forward_tenor():
-    valid_tenors = [datetime.date(2020, 1, 1), '1y', 'imm2', 'frb2', '1m', '0b']
-    for tenor in valid_tenors:
-        assert tenor == tm_rates.check_forward_tenor(tenor)
-
-    invalid_tenors = ['5yr', 'imm5', 'frb0']
-    for tenor in invalid_tenors:
-        with pytest.raises(MqError):
-            tm_rates.check_forward_tenor(tenor)
-
-
-def mock_commod(_cls, _q):
-    d = {
-        'price': [30, 30, 30, 30, 35.929686, 35.636039, 27.307498, 23.23177, 19.020833, 18.827291, 17.823749, 17.393958,
-                  17.824999, 20.307603, 24.311249, 25.160103, 25.245728, 25.736873, 28.425206, 28.779789, 30.519996,
-                  34.896348, 33.966973, 33.95489, 33.686348, 34.840307, 32.674163, 30.261665, 30, 30, 30]
-    }
-    df = MarketDataResponseFrame(data=d, index=pd.date_range('2019-05-01', periods=31, freq='H', tz=timezone('UTC')))
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_forward_price(_cls, _q):
-    d = {
-        'forwardPrice': [
-            22.0039,
-            24.8436,
-            24.8436,
-            11.9882,
-            14.0188,
-            11.6311,
-            18.9234,
-            21.3654,
-            21.3654,
-        ],
-        'quantityBucket': [
-            "PEAK",
-            "PEAK",
-            "PEAK",
-            "7X8",
-            "7X8",
-            "7X8",
-            "2X16H",
-            "2X16H",
-            "2X16H",
-
-        ],
-        'contract': [
-            "J20",
-            "K20",
-            "M20",
-            "J20",
-            "K20",
-            "M20",
-            "J20",
-            "K20",
-            "M20",
-        ]
-
-    }
-    df = MarketDataResponseFrame(data=d, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 9))
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_fair_price(_cls, _q):
-    d = {
-        'fairPrice': [
-            2.880,
-            2.844,
-            2.726,
-        ],
-        'contract': [
-            "F21",
-            "G21",
-            "H21",
-        ]}
-    df = MarketDataResponseFrame(data=d, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 3))
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_implied_volatility(_cls, _q):
-    d = {
-        'impliedVolatility': [
-            2.880,
-            2.844,
-            2.726,
-        ],
-        'contract': [
-            "F21",
-            "G21",
-            "H21",
-        ]}
-    df = MarketDataResponseFrame(data=d, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 3))
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_missing_bucket_forward_price(_cls, _q):
-    d = {
-        'forwardPrice': [
-            22.0039,
-            24.8436,
-            24.8436,
-            11.9882,
-            14.0188,
-            18.9234,
-            21.3654,
-            21.3654,
-        ],
-        'quantityBucket': [
-            "PEAK",
-            "PEAK",
-            "PEAK",
-            "7X8",
-            "7X8",
-            "2X16H",
-            "2X16H",
-            "2X16H",
-
-        ],
-        'contract': [
-            "J20",
-            "K20",
-            "M20",
-            "J20",
-            "K20",
-            "J20",
-            "K20",
-            "M20",
-        ]
+@pytest.mark.parametrize('tenor', [datetime.date(2020, 1, 1), '1y', 'imm2', 'frb2', '1m', '0b'])
+def test_check_forward_tenor_valid(tenor):
+    assert tenor == check_forward_tenor(tenor)
 
-    }
-    return pd.DataFrame(data=d, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 8))
-
-
-def mock_fx(_cls, _q):
-    d = {
-        'strikeReference': ['delta', 'spot', 'forward'],
-        'relativeStrike': [25, 100, 100],
-        'impliedVolatility': [5, 1, 2],
-        'forecast': [1.1, 1.1, 1.1]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_fx_delta(_cls, _q):
-    d = {
-        'relativeStrike': [25, -25, 0],
-        'impliedVolatility': [1, 5, 2],
-        'forecast': [1.1, 1.1, 1.1]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
 
-
-def mock_fx_empty(_cls, _q):
-    d = {
-        'strikeReference': [],
-        'relativeStrike': [],
-        'impliedVolatility': []
-    }
-    df = MarketDataResponseFrame(data=d, index=[])
-    df.dataset_ids = _test_datasets
-    return df
+@pytest.mark.parametrize('tenor', ['5yr', 'imm5', 'frb0'])
+def test_check_forward_tenor_invalid(tenor):
+    with pytest.raises(MqError):
+        check_forward_tenor(tenor)
+
+
+def _canned_response(data: dict, index=None) -> MarketDataResponseFrame:
+    return MarketDataResponseFrame(data=data, index=index, copy=False, dataset_ids=_test_datasets)
+
+
+def _copy_response(df: pd.DataFrame) -> pd.DataFrame:
+    # measures write helper columns into the frame they receive, so hand out copies of the canned data
+    copy = df.copy()
+    copy.dataset_ids = getattr(df, 'dataset_ids', ())
+    return copy
+
+
+_COMMOD = _canned_response({
+    'price': [30, 30, 30, 30, 35.929686, 35.636039, 27.307498, 23.23177, 19.020833, 18.827291, 17.823749, 17.393958,
+              17.824999, 20.307603, 24.311249, 25.160103, 25.245728, 25.736873, 28.425206, 28.779789, 30.519996,
+              34.896348, 33.966973, 33.95489, 33.686348, 34.840307, 32.674163, 30.261665, 30, 30, 30]
+}, index=pd.date_range('2019-05-01', periods=31, freq='H', tz=timezone('UTC')))
+
+_FORWARD_PRICE = _canned_response({
+    'forwardPrice': [
+        22.0039,
+        24.8436,
+        24.8436,
+        11.9882,
+        14.0188,
+        11.6311,
+        18.9234,
+        21.3654,
+        21.3654,
+    ],
+    'quantityBucket': [
+        "PEAK",
+        "PEAK",
+        "PEAK",
+        "7X8",
+        "7X8",
+        "7X8",
+        "2X16H",
+        "2X16H",
+        "2X16H",
+
+    ],
+    'contract': [
+        "J20",
+        "K20",
+        "M20",
+        "J20",
+        "K20",
+        "M20",
+        "J20",
+        "K20",
+        "M20",
+    ]
+
+}, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 9))
+
+_FAIR_PRICE = _canned_response({
+    'fairPrice': [
+        2.880,
+        2.844,
+        2.726,
+    ],
+    'contract': [
+        "F21",
+        "G21",
+        "H21",
+    ]}, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 3))
+
+_IMPLIED_VOLATILITY = _canned_response({
+    'impliedVolatility': [
+        2.880,
+        2.844,
+        2.726,
+    ],
+    'contract': [
+        "F21",
+        "G21",
+        "H21",
+    ]}, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 3))
+
+_MISSING_BUCKET_FORWARD_PRICE = pd.DataFrame(data={
+    'forwardPrice': [
+        22.0039,
+        24.8436,
+        24.8436,
+        11.9882,
+        14.0188,
+        18.9234,
+        21.3654,
+        21.3654,
+    ],
+    'quantityBucket': [
+        "PEAK",
+        "PEAK",
+        "PEAK",
+        "7X8",
+        "7X8",
+        "2X16H",
+        "2X16H",
+        "2X16H",
+
+    ],
+    'contract': [
+        "J20",
+        "K20",
+        "M20",
+        "J20",
+        "K20",
+        "J20",
+        "K20",
+        "M20",
+    ]
+
+}, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 8))
+
+
+def mock_commod(_q):
+    return _copy_response(_COMMOD)
+
+
+def mock_forward_price(_q):
+    return _copy_response(_FORWARD_PRICE)
+
+
+def mock_fair_price(_q):
+    return _copy_response(_FAIR_PRICE)
+
+
+def mock_implied_volatility(_q):
+    return _copy_response(_IMPLIED_VOLATILITY)
+
+
+def mock_missing_bucket_forward_price(_q):
+    return _MISSING_BUCKET_FORWARD_PRICE.copy()
+
+
+_FX = _canned_response({
+    'strikeReference': ['delta', 'spot', 'forward'],
+    'relativeStrike': [25, 100, 100],
+    'impliedVolatility': [5, 1, 2],
+    'forecast': [1.1, 1.1, 1.1]
+}, index=_INDEX3)
+
+_FX_DELTA = _canned_response({
+    'relativeStrike': [25, -25, 0],
+    'impliedVolatility': [1, 5, 2],
+    'forecast': [1.1, 1.1, 1.1]
+}, index=_INDEX3)
 
 
 def mock_fx_switch(_cls, _q, _n):
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fx_empty)
-    replace.restore()
     return Cross('MA1889', 'ABC/XYZ')
 
 
-def mock_curr(_cls, _q):
-    d = {
-        'swapAnnuity': [1, 2, 3],
-        'swapRate': [1, 2, 3],
-        'basisSwapRate': [1, 2, 3],
-        'swaptionVol': [1, 2, 3],
-        'atmFwdRate': [1, 2, 3],
-        'midcurveVol': [1, 2, 3],
-        'capFloorVol': [1, 2, 3],
-        'spreadOptionVol': [1, 2, 3],
-        'inflationSwapRate': [1, 2, 3],
-        'midcurveAtmFwdRate': [1, 2, 3],
-        'capFloorAtmFwdRate': [1, 2, 3],
-        'spreadOptionAtmFwdRate': [1, 2, 3]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_cross(_cls, _q):
-    d = {
-        'basis': [1, 2, 3],
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_eq(_cls, _q):
-    d = {
-        'relativeStrike': [0.75, 0.25, 0.5],
-        'impliedVolatility': [5, 1, 2],
-        'impliedCorrelation': [5, 1, 2],
-        'averageImpliedVolatility': [5, 1, 2],
-        'averageImpliedVariance': [5, 1, 2],
-        'impliedVolatilityByDeltaStrike': [5, 1, 2],
-        'fundamentalMetric': [5, 1, 2]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_eq_norm(_cls, _q):
-    d = {
-        'relativeStrike': [-4.0, 4.0, 0],
-        'impliedVolatility': [5, 1, 2]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_eq_spot(_cls, _q):
-    d = {
-        'relativeStrike': [0.75, 1.25, 1.0],
-        'impliedVolatility': [5, 1, 2]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_inc(_cls, _q):
-    d = {
-        'relativeStrike': [0.25, 0.75],
-        'impliedVolatility': [5, 1]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 2)
-    df.dataset_ids = _test_datasets
-    return df
-
-
-def mock_meeting_expectation():
-    data_dict = MarketDataResponseFrame({'date': [dt.date(2019, 12, 6)],
+_CURR = _canned_response({
+    'swapAnnuity': [1, 2, 3],
+    'swapRate': [1, 2, 3],
+    'basisSwapRate': [1, 2, 3],
+    'swaptionVol': [1, 2, 3],
+    'atmFwdRate': [1, 2, 3],
+    'midcurveVol': [1, 2, 3],
+    'capFloorVol': [1, 2, 3],
+    'spreadOptionVol': [1, 2, 3],
+    'inflationSwapRate': [1, 2, 3],
+    'midcurveAtmFwdRate': [1, 2, 3],
+    'capFloorAtmFwdRate': [1, 2, 3],
+    'spreadOptionAtmFwdRate': [1, 2, 3]
+}, index=_INDEX3)
+
+_CROSS = _canned_response({
+    'basis': [1, 2, 3],
+}, index=_INDEX3)
+
+_EQ = _canned_response({
+    'relativeStrike': [0.75, 0.25, 0.5],
+    'impliedVolatility': [5, 1, 2],
+    'impliedCorrelation': [5, 1, 2],
+    'averageImpliedVolatility': [5, 1, 2],
+    'averageImpliedVariance': [5, 1, 2],
+    'impliedVolatilityByDeltaStrike': [5, 1, 2],
+    'fundamentalMetric': [5, 1, 2]
+}, index=_INDEX3)
+
+_EQ_NORM = _canned_response({
+    'relativeStrike': [-4.0, 4.0, 0],
+    'impliedVolatility': [5, 1, 2]
+}, index=_INDEX3)
+
+_EQ_SPOT = _canned_response({
+    'relativeStrike': [0.75, 1.25, 1.0],
+    'impliedVolatility': [5, 1, 2]
+}, index=_INDEX3)
+
+_INC = _canned_response({
+    'relativeStrike': [0.25, 0.75],
+    'impliedVolatility': [5, 1]
+}, index=_INDEX2)
+
+_MEETING_EXPECTATION = _canned_response({'date': [dt.date(2019, 12, 6)],
                                          'assetId': ['MARFAGXDQRWM07Y2'],
                                          'location': ['NYC'],
                                          'rateType': ['Meeting Forward'],
@@ -642,508 +625,432 @@ def mock_meeting_expectation():
                                          'meetingDate': [dt.date(2020, 1, 23)],
                                          'value': [-0.004550907771]
                                          })
-    data_dict.dataset_ids = _test_datasets
-    return data_dict
+
+_MEETING_SPOT = _canned_response({'date': [dt.date(2019, 12, 6)],
+                                  'assetId': ['MARFAGXDQRWM07Y2'],
+                                  'location': ['NYC'],
+                                  'rateType': ['Meeting Forward'],
+                                  'startingDate': [dt.date(2019, 10, 30)],
+                                  'endingDate': [dt.date(2019, 12, 18)],
+                                  'meetingNumber': [0],
+                                  'valuationDate': [dt.date(2019, 12, 6)],
+                                  'meetingDate': [dt.date(2019, 10, 24)],
+                                  'value': [-0.004522570525]
+                                  })
+
+_MEETING_ABSOLUTE = pd.concat([_MEETING_SPOT, _MEETING_EXPECTATION], ignore_index=True)
+_MEETING_ABSOLUTE.dataset_ids = _test_datasets
+
+_OIS_SPOT = _canned_response({'date': [datetime.date(2019, 12, 6)],
+                              'assetId': ['MARFAGXDQRWM07Y2'],
+                              'location': ['NYC'],
+                              'rateType': ['Spot'],
+                              'startingDate': [datetime.date(2019, 12, 6)],
+                              'endingDate': [datetime.date(2019, 12, 7)],
+                              'meetingNumber': [-1],
+                              'valuationDate': [datetime.date(2019, 12, 6)],
+                              'meetingDate': [datetime.date(2019, 12, 6)],
+                              'value': [-0.00455]
+                              })
+
+
+def mock_meeting_expectation():
+    return _copy_response(_MEETING_EXPECTATION)
 
 
 def mock_meeting_spot():
-    data_dict = MarketDataResponseFrame({'date': [dt.date(2019, 12, 6)],
-                                         'assetId': ['MARFAGXDQRWM07Y2'],
-                                         'location': ['NYC'],
-                                         'rateType': ['Meeting Forward'],
-                                         'startingDate': [dt.date(2019, 10, 30)],
-                                         'endingDate': [dt.date(2019, 12, 18)],
-                                         'meetingNumber': [0],
-                                         'valuationDate': [dt.date(2019, 12, 6)],
-                                         'meetingDate': [dt.date(2019, 10, 24)],
-                                         'value': [-0.004522570525]
-                                         })
-    data_dict.dataset_ids = _test_datasets
-    return data_dict
+    return _copy_response(_MEETING_SPOT)
 
 
 def mock_meeting_absolute():
-    data_dict = MarketDataResponseFrame({'date': [datetime.date(2019, 12, 6), datetime.date(2019, 12, 6)],
-                                         'assetId': ['MARFAGXDQRWM07Y2', 'MARFAGXDQRWM07Y2'],
-                                         'location': ['NYC', 'NYC'],
-                                         'rateType': ['Meeting Forward', 'Meeting Forward'],
-                                         'startingDate': [datetime.date(2019, 10, 30), datetime.date(2020, 1, 29)],
-                                         'endingDate': [datetime.date(2019, 10, 30), datetime.date(2020, 1, 29)],
-                                         'meetingNumber': [0, 2],
-                                         'valuationDate': [datetime.date(2019, 12, 6), datetime.date(2019, 12, 6)],
-                                         'meetingDate': [datetime.date(2019, 10, 24), datetime.date(2020, 1, 23)],
-                                         'value': [-0.004522570525, -0.004550907771]
-                                         })
-    data_dict.dataset_ids = _test_datasets
-    return data_dict
+    return _copy_response(_MEETING_ABSOLUTE)
 
 
 def mock_ois_spot():
-    data_dict = MarketDataResponseFrame({'date': [datetime.date(2019, 12, 6)],
-                                         'assetId': ['MARFAGXDQRWM07Y2'],
-                                         'location': ['NYC'],
-                                         'rateType': ['Spot'],
-                                         'startingDate': [datetime.date(2019, 12, 6)],
-                                         'endingDate': [datetime.date(2019, 12, 7)],
-                                         'meetingNumber': [-1],
-                                         'valuationDate': [datetime.date(2019, 12, 6)],
-                                         'meetingDate': [datetime.date(2019, 12, 6)],
-                                         'value': [-0.00455]
-                                         })
-    data_dict.dataset_ids = _test_datasets
-    return data_dict
+    return _copy_response(_OIS_SPOT)
 
 
-def mock_esg(_cls, _q):
-    d = {
-        'esNumericScore': [2, 4, 6],
-        "esNumericPercentile": [81.2, 75.4, 65.7],
-        "esPolicyScore": [2, 4, 6],
-        "esPolicyPercentile": [81.2, 75.4, 65.7],
-        "esScore": [2, 4, 6],
-        "esPercentile": [81.2, 75.4, 65.7],
-        "gScore": [2, 4, 6],
-        "gPercentile": [81.2, 75.4, 65.7],
-        "esMomentumScore": [2, 4, 6],
-        "esMomentumPercentile": [81.2, 75.4, 65.7],
-        "gRegionalScore": [2, 4, 6],
-        "gRegionalPercentile": [81.2, 75.4, 65.7],
-        "esDisclosurePercentage": [49.2, 55.7, 98.4]
-    }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    return df
+_ESG = _canned_response({
+    'esNumericScore': [2, 4, 6],
+    "esNumericPercentile": [81.2, 75.4, 65.7],
+    "esPolicyScore": [2, 4, 6],
+    "esPolicyPercentile": [81.2, 75.4, 65.7],
+    "esScore": [2, 4, 6],
+    "esPercentile": [81.2, 75.4, 65.7],
+    "gScore": [2, 4, 6],
+    "gPercentile": [81.2, 75.4, 65.7],
+    "esMomentumScore": [2, 4, 6],
+    "esMomentumPercentile": [81.2, 75.4, 65.7],
+    "gRegionalScore": [2, 4, 6],
+    "gRegionalPercentile": [81.2, 75.4, 65.7],
+    "esDisclosurePercentage": [49.2, 55.7, 98.4]
+}, index=_INDEX3)
 
 
-def test_skew():
-    replace = Replacer()
+def test_skew(mocker):
 
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
-    actual = tm.skew(mock_spx, '1m', tm.SkewReference.DELTA, 25)
-    assert_series_equal(pd.Series([2.0], index=_index, name='impliedVolatility'), pd.Series(actual))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
+    actual = skew(mock_spx, '1m', SkewReference.DELTA, 25)
+    assert_series_equal(_EXPECTED_SKEW, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq_norm)
-    actual = tm.skew(mock_spx, '1m', tm.SkewReference.NORMALIZED, 4)
-    assert_series_equal(pd.Series([2.0], index=_index, name='impliedVolatility'), pd.Series(actual))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ_NORM)
+    actual = skew(mock_spx, '1m', SkewReference.NORMALIZED, 4)
+    assert_series_equal(_EXPECTED_SKEW, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq_spot)
-    actual = tm.skew(mock_spx, '1m', tm.SkewReference.SPOT, 25)
-    assert_series_equal(pd.Series([2.0], index=_index, name='impliedVolatility'), pd.Series(actual))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ_SPOT)
+    actual = skew(mock_spx, '1m', SkewReference.SPOT, 25)
+    assert_series_equal(_EXPECTED_SKEW, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
-    mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    mock.return_value = mock_empty_market_data_response()
-    actual = tm.skew(mock_spx, '1m', tm.SkewReference.SPOT, 25)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=mock_empty_market_data_response())
+    actual = skew(mock_spx, '1m', SkewReference.SPOT, 25)
     assert actual.empty
 
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_inc)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_INC)
     with pytest.raises(MqError):
-        tm.skew(mock_spx, '1m', tm.SkewReference.DELTA, 25)
-    replace.restore()
+        skew(mock_spx, '1m', SkewReference.DELTA, 25)
 
     with pytest.raises(MqError):
-        tm.skew(mock_spx, '1m', None, 25)
+        skew(mock_spx, '1m', None, 25)
 
     with pytest.raises(MqError):
-        tm.skew(mock_spx, '1m', tm.SkewReference.SPOT, 25, real_time=True)
+        skew(mock_spx, '1m', SkewReference.SPOT, 25, real_time=True)
 
 
-def test_skew_fx():
-    replace = Replacer()
+def test_skew_fx(mocker, monkeypatch):
     cross = Cross('MAA0NE9QX2ABETG6', 'USD/EUR')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EURUSD', ))]
-    replace('gs_quant.markets.securities.SecurityMaster.get_asset', Mock()).return_value = cross
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fx_delta)
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _stub(_FX_XREF_EURUSD))
+    monkeypatch.setattr('gs_quant.markets.securities.SecurityMaster.get_asset', _stub(cross))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_FX_DELTA)
     mock = cross
 
-    actual = tm.skew(mock, '1m', tm.SkewReference.DELTA, 25)
-    assert_series_equal(pd.Series([2.0], index=_index, name='impliedVolatility'), pd.Series(actual))
+    actual = skew(mock, '1m', SkewReference.DELTA, 25)
+    assert_series_equal(_EXPECTED_SKEW, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(MqError):
-        tm.skew(mock, '1m', tm.SkewReference.DELTA, 25, real_time=True)
+        skew(mock, '1m', SkewReference.DELTA, 25, real_time=True)
     with pytest.raises(MqError):
-        tm.skew(mock, '1m', tm.SkewReference.SPOT, 25)
+        skew(mock, '1m', SkewReference.SPOT, 25)
     with pytest.raises(MqError):
-        tm.skew(mock, '1m', tm.SkewReference.FORWARD, 25)
+        skew(mock, '1m', SkewReference.FORWARD, 25)
     with pytest.raises(MqError):
-        tm.skew(mock, '1m', tm.SkewReference.NORMALIZED, 25)
+        skew(mock, '1m', SkewReference.NORMALIZED, 25)
     with pytest.raises(MqError):
-        tm.skew(mock, '1m', None, 25)
+        skew(mock, '1m', None, 25)
 
-    replace.restore()
 
-
-def test_vol():
-    replace = Replacer()
+def test_vol(mocker):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.implied_volatility(mock_spx, '1m', tm.VolReference.DELTA_CALL, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedVolatility'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.implied_volatility(mock_spx, '1m', tm.VolReference.DELTA_PUT, 75)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedVolatility'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(MqError):
         tm.implied_volatility(mock_spx, '1m', tm.VolReference.DELTA_NEUTRAL)
-    replace.restore()
-
-
-def test_vol_fx():
-    replace = Replacer()
 
-    mock = Cross('MAA0NE9QX2ABETG6', 'USD/EUR')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EURUSD', ))]
-    replace('gs_quant.markets.securities.SecurityMaster.get_asset', Mock()).return_value = mock
-
-    # for different delta strikes
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fx)
-    actual = tm.implied_volatility(mock, '1m', tm.VolReference.DELTA_CALL, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    actual = tm.implied_volatility(mock, '1m', tm.VolReference.DELTA_PUT, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    actual = tm.implied_volatility(mock, '1m', tm.VolReference.DELTA_NEUTRAL)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    actual = tm.implied_volatility(mock, '1m', tm.VolReference.FORWARD, 100)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    actual = tm.implied_volatility(mock, '1m', tm.VolReference.SPOT, 100)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatility'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
 
-    # NORMALIZED not supported
-    with pytest.raises(MqError):
-        tm.implied_volatility(mock, '1m', tm.VolReference.DELTA_CALL)
-    with pytest.raises(MqError):
-        tm.implied_volatility(mock, '1m', tm.VolReference.NORMALIZED, 25)
-    with pytest.raises(MqError):
-        tm.implied_volatility(mock, '1m', tm.VolReference.SPOT, 25)
+@pytest.fixture
+def fx_vol_env(mocker, monkeypatch):
+    cross = Cross('MAA0NE9QX2ABETG6', 'USD/EUR')
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _stub(_FX_XREF_EURUSD))
+    monkeypatch.setattr('gs_quant.markets.securities.SecurityMaster.get_asset', _stub(cross))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_FX)
+    return cross
+
+
+@pytest.mark.parametrize('reference, strike', [
+    (tm.VolReference.DELTA_CALL, 25),
+    (tm.VolReference.DELTA_PUT, 25),
+    (tm.VolReference.DELTA_NEUTRAL, None),
+    (tm.VolReference.FORWARD, 100),
+    (tm.VolReference.SPOT, 100),
+])
+def test_vol_fx(fx_vol_env, reference, strike):
+    actual = tm.implied_volatility(fx_vol_env, '1m', reference, strike)
+    assert_series_equal(_EXPECTED_512.rename('impliedVolatility'), actual, check_series_type=False)
+    assert actual.dataset_ids == _test_datasets
+
+
+@pytest.mark.parametrize('reference, strike', [
+    (tm.VolReference.DELTA_CALL, None),
+    (tm.VolReference.NORMALIZED, 25),
+    (tm.VolReference.SPOT, 25),
+    (tm.VolReference.FORWARD, 25),
+])
+def test_vol_fx_unsupported(fx_vol_env, reference, strike):
     with pytest.raises(MqError):
-        tm.implied_volatility(mock, '1m', tm.VolReference.FORWARD, 25)
-    replace.restore()
+        tm.implied_volatility(fx_vol_env, '1m', reference, strike)
 
 
-def test_vol_forecast():
-    replace = Replacer()
+def test_vol_forecast(mocker, monkeypatch):
     mock = Cross('MAA0NE9QX2ABETG6', 'USD/EUR')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EURUSD', ))]
-    replace('gs_quant.markets.securities.SecurityMaster.get_asset', Mock()).return_value = mock
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fx)
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _stub(_FX_XREF_EURUSD))
+    monkeypatch.setattr('gs_quant.markets.securities.SecurityMaster.get_asset', _stub(mock))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_FX)
 
     actual = tm.forecast(mock, '1y')
-    assert_series_equal(pd.Series([1.1, 1.1, 1.1], index=_index * 3, name='forecast'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_FORECAST, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.forecast(mock, '3m')
-    assert_series_equal(pd.Series([1.1, 1.1, 1.1], index=_index * 3, name='forecast'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_FORECAST, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.forecast(mock, '1y', real_time=True)
-    replace.restore()
 
 
-def test_vol_forecast_inverse():
-    replace = Replacer()
-    get_cross = replace('gs_quant.timeseries.measures.cross_to_usd_based_cross', Mock())
-    get_cross.return_value = "MATGYV0J9MPX534Z"
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fx)
+def test_vol_forecast_inverse(mocker, monkeypatch):
+    monkeypatch.setattr('gs_quant.timeseries.measures.cross_to_usd_based_cross', _stub("MATGYV0J9MPX534Z"))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_FX)
 
     mock = Cross("MAYJPCVVF2RWXCES", 'USD/JPY')
     actual = tm.forecast(mock, '3m')
-    assert_series_equal(pd.Series([1 / 1.1, 1 / 1.1, 1 / 1.1], index=_index * 3, name='forecast'), pd.Series(actual))
+    assert_series_equal(pd.Series([1 / 1.1, 1 / 1.1, 1 / 1.1], index=_INDEX3, name='forecast'),
+                        actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
-    replace.restore()
 
 
-def test_vol_smile():
-    replace = Replacer()
+def test_vol_smile(mocker):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.vol_smile(mock_spx, '1m', tm.VolSmileReference.FORWARD, '5d')
-    assert_series_equal(pd.Series([5, 1, 2], index=[0.75, 0.25, 0.5]), pd.Series(actual))
+    assert_series_equal(pd.Series([5, 1, 2], index=[0.75, 0.25, 0.5]), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.vol_smile(mock_spx, '1m', tm.VolSmileReference.SPOT, '5d')
-    assert_series_equal(pd.Series([5, 1, 2], index=[0.75, 0.25, 0.5]), pd.Series(actual))
+    assert_series_equal(pd.Series([5, 1, 2], index=[0.75, 0.25, 0.5]), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = mock_empty_market_data_response()
+    market_mock = mocker.patch.object(GsDataApi, 'get_market_data', return_value=mock_empty_market_data_response())
     actual = tm.vol_smile(mock_spx, '1m', tm.VolSmileReference.SPOT, '1d')
     assert actual.empty
     assert actual.dataset_ids == ()
     market_mock.assert_called_once()
     with pytest.raises(NotImplementedError):
         tm.vol_smile(mock_spx, '1m', tm.VolSmileReference.SPOT, '1d', real_time=True)
-    replace.restore()
 
 
-def test_impl_corr():
-    replace = Replacer()
+def test_impl_corr(mocker):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.implied_correlation(mock_spx, '1m', tm.EdrDataReference.DELTA_CALL, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedCorrelation'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedCorrelation'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.implied_correlation(mock_spx, '1m', tm.EdrDataReference.DELTA_PUT, 75)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedCorrelation'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedCorrelation'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.implied_correlation(..., '1m', tm.EdrDataReference.DELTA_PUT, 75, real_time=True)
-    replace.restore()
 
 
-def test_cds_implied_vol():
-    replace = Replacer()
+def test_cds_implied_vol(mocker):
     mock_cds = Index('MA890', AssetClass.Equity, 'CDS')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.cds_implied_volatility(mock_cds, '1m', '5y', tm.CdsVolReference.DELTA_CALL, 10)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatilityByDeltaStrike'),
-                        pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedVolatilityByDeltaStrike'),
+                        actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.cds_implied_volatility(mock_cds, '1m', '5y', tm.CdsVolReference.FORWARD, 100)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='impliedVolatilityByDeltaStrike'),
-                        pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('impliedVolatilityByDeltaStrike'),
+                        actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.cds_implied_volatility(..., '1m', '5y', tm.CdsVolReference.DELTA_PUT, 75, real_time=True)
-    replace.restore()
 
 
-def test_avg_impl_vol():
-    replace = Replacer()
+def test_avg_impl_vol(mocker):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.average_implied_volatility(mock_spx, '1m', tm.EdrDataReference.DELTA_CALL, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='averageImpliedVolatility'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('averageImpliedVolatility'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.average_implied_volatility(mock_spx, '1m', tm.EdrDataReference.DELTA_PUT, 75)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='averageImpliedVolatility'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('averageImpliedVolatility'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.average_implied_volatility(..., '1m', tm.EdrDataReference.DELTA_PUT, 75, real_time=True)
-    replace.restore()
 
 
-def test_avg_impl_var():
-    replace = Replacer()
+def test_avg_impl_var(mocker):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     actual = tm.average_implied_variance(mock_spx, '1m', tm.EdrDataReference.DELTA_CALL, 25)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='averageImpliedVariance'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('averageImpliedVariance'), actual, check_series_type=False)
     actual = tm.average_implied_variance(mock_spx, '1m', tm.EdrDataReference.DELTA_PUT, 75)
     assert actual.dataset_ids == _test_datasets
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='averageImpliedVariance'), pd.Series(actual))
+    assert_series_equal(_EXPECTED_512.rename('averageImpliedVariance'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.average_implied_variance(..., '1m', tm.EdrDataReference.DELTA_PUT, 75, real_time=True)
-    replace.restore()
 
 
-def test_basis_swap_spread(mocker):
-    replace = Replacer()
-    args = dict(swap_tenor='10y', spread_benchmark_type=None, spread_tenor=None,
-                reference_benchmark_type=None, reference_tenor=None, forward_tenor='0b', real_time=False)
+# read-only templates; tests take a dict() copy before filling in the asset and tenors
+_BASIS_SWAP_SPREAD_ARGS = MappingProxyType(dict(swap_tenor='10y', spread_benchmark_type=None, spread_tenor=None,
+                                                reference_benchmark_type=None, reference_tenor=None, forward_tenor='0b',
+                                                real_time=False))
+_SWAP_RATE_ARGS = MappingProxyType(dict(swap_tenor='10y', benchmark_type=None, floating_rate_tenor=None,
+                                        forward_tenor='0b', real_time=False))
+_SWAP_TERM_STRUCTURE_ARGS = MappingProxyType(dict(benchmark_type=None, floating_rate_tenor=None, forward_tenor='0b',
+                                                  real_time=False))
+_BASIS_SWAP_TERM_STRUCTURE_ARGS = MappingProxyType(dict(spread_benchmark_type=None, spread_tenor=None,
+                                                        reference_benchmark_type=None, reference_tenor=None,
+                                                        forward_tenor='0b', real_time=False))
+
+_TERM_ASSET_IDS = ['MAEMPCXQG3T716EX', 'MAFRSWPAF5QPNTP2', 'MA88BXZ3TCTXTFW1', 'MAC4KAG9B9ZAZHFT']
+_SWAP_TERM_DF = pd.DataFrame(data={'terminationTenor': ['1y', '2y', '3y', '4y'], 'swapRate': [1, 2, 3, 4],
+                                   'assetId': _TERM_ASSET_IDS}, index=_INDEX4)
+_BASIS_SWAP_TERM_DF = pd.DataFrame(data={'terminationTenor': ['1y', '2y', '3y', '4y'], 'basisSwapRate': [1, 2, 3, 4],
+                                         'assetId': _TERM_ASSET_IDS}, index=_INDEX4)
+
+
+@pytest.fixture
+def usd_swap_asset(monkeypatch):
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', _stub('USD'))
+    return Currency('MAZ7RWC904JYHYPS', 'USD')
+
+
+@pytest.mark.parametrize('measure, valid_args, field, bad_value', [
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'swap_tenor', '5yr'),
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'spread_tenor', '5yr'),
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'reference_tenor', '5yr'),
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'forward_tenor', '5yr'),
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'spread_benchmark_type', BenchmarkType.STIBOR),
+    (tm_rates.basis_swap_spread, _BASIS_SWAP_SPREAD_ARGS, 'reference_benchmark_type', BenchmarkType.STIBOR),
+    (tm_rates.swap_rate, _SWAP_RATE_ARGS, 'swap_tenor', '5yr'),
+    (tm_rates.swap_rate, _SWAP_RATE_ARGS, 'floating_rate_tenor', '5yr'),
+    (tm_rates.swap_rate, _SWAP_RATE_ARGS, 'forward_tenor', '5yr'),
+    (tm_rates.swap_rate, _SWAP_RATE_ARGS, 'benchmark_type', BenchmarkType.STIBOR),
+    (tm_rates.swap_annuity, _SWAP_RATE_ARGS, 'swap_tenor', '5yr'),
+    (tm_rates.swap_annuity, _SWAP_RATE_ARGS, 'floating_rate_tenor', '5yr'),
+    (tm_rates.swap_annuity, _SWAP_RATE_ARGS, 'forward_tenor', '5yr'),
+    (tm_rates.swap_annuity, _SWAP_RATE_ARGS, 'benchmark_type', BenchmarkType.STIBOR),
+    (tm_rates.swap_term_structure, _SWAP_TERM_STRUCTURE_ARGS, 'floating_rate_tenor', '5yr'),
+    (tm_rates.swap_term_structure, _SWAP_TERM_STRUCTURE_ARGS, 'forward_tenor', '5yr'),
+    (tm_rates.swap_term_structure, _SWAP_TERM_STRUCTURE_ARGS, 'benchmark_type', BenchmarkType.STIBOR),
+    (tm_rates.basis_swap_term_structure, _BASIS_SWAP_TERM_STRUCTURE_ARGS, 'spread_tenor', '5yr'),
+    (tm_rates.basis_swap_term_structure, _BASIS_SWAP_TERM_STRUCTURE_ARGS, 'reference_tenor', '5yr'),
+    (tm_rates.basis_swap_term_structure, _BASIS_SWAP_TERM_STRUCTURE_ARGS, 'forward_tenor', '5yr'),
+    (tm_rates.basis_swap_term_structure, _BASIS_SWAP_TERM_STRUCTURE_ARGS, 'spread_benchmark_type',
+     BenchmarkType.STIBOR),
+    (tm_rates.basis_swap_term_structure, _BASIS_SWAP_TERM_STRUCTURE_ARGS, 'reference_benchmark_type',
+     BenchmarkType.STIBOR),
+])
+def test_swap_measure_invalid_args(usd_swap_asset, measure, valid_args, field, bad_value):
+    args = dict(valid_args, asset=usd_swap_asset)
+    args[field] = bad_value
+    with pytest.raises(MqValueError):
+        measure(**args)
+
+
+def test_basis_swap_spread(mocker, monkeypatch):
+    args = dict(_BASIS_SWAP_SPREAD_ARGS)
 
     mock_nok = Currency('MA891', 'NOK')
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'NOK'
+    xrefs = Mock(return_value='NOK')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', xrefs)
     args['asset'] = mock_nok
     with pytest.raises(NotImplementedError):
         tm_rates.basis_swap_spread(**args)
 
     mock_usd = Currency('MAZ7RWC904JYHYPS', 'USD')
     args['asset'] = mock_usd
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
     xrefs.return_value = 'USD'
     with pytest.raises(NotImplementedError):
         tm_rates.basis_swap_spread(..., '1y', real_time=True)
 
-    args['swap_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['swap_tenor'] = '6y'
-
-    args['spread_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['spread_tenor'] = '3m'
-
-    args['reference_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['reference_tenor'] = '6m'
-
-    args['forward_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['forward_tenor'] = None
-
-    args['spread_benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['spread_benchmark_type'] = BenchmarkType.LIBOR
+    args.update(swap_tenor='6y', spread_tenor='3m', reference_tenor='6m', forward_tenor=None,
+                spread_benchmark_type=BenchmarkType.LIBOR, reference_benchmark_type=BenchmarkType.LIBOR)
 
-    args['reference_benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_spread(**args)
-    args['reference_benchmark_type'] = BenchmarkType.LIBOR
-
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'USD'
-    identifiers = replace('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates', Mock())
-    identifiers.return_value = {'MAQB1PGEJFCET3GG'}
-    mocker.patch.object(GsDataApi, 'get_market_data', return_value=mock_curr(None, None))
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates',
+                        _stub({'MAQB1PGEJFCET3GG'}))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_CURR)
     actual = tm_rates.basis_swap_spread(**args)
-    expected = tm.ExtendedSeries([1, 2, 3], index=_index * 3, name='basisSwapRate')
+    expected = tm.ExtendedSeries([1, 2, 3], index=_INDEX3, name='basisSwapRate')
     expected.dataset_ids = _test_datasets
     assert_series_equal(expected, actual)
     assert actual.dataset_ids == expected.dataset_ids
-    replace.restore()
 
 
-def test_swap_rate(mocker):
-    replace = Replacer()
-    args = dict(swap_tenor='10y', benchmark_type=None, floating_rate_tenor=None, forward_tenor='0b', real_time=False)
+def test_swap_rate(mocker, monkeypatch):
+    args = dict(_SWAP_RATE_ARGS)
 
     mock_nok = Currency('MA891', 'NOK')
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'NOK'
+    xrefs = Mock(return_value='NOK')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', xrefs)
     args['asset'] = mock_nok
     with pytest.raises(NotImplementedError):
         tm_rates.swap_rate(**args)
 
     mock_usd = Currency('MAZ7RWC904JYHYPS', 'USD')
     args['asset'] = mock_usd
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
     xrefs.return_value = 'USD'
     with pytest.raises(NotImplementedError):
         tm_rates.swap_rate(..., '1y', real_time=True)
 
-    args['swap_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_rate(**args)
-    args['swap_tenor'] = '10y'
-
-    args['floating_rate_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_rate(**args)
-    args['floating_rate_tenor'] = '3m'
-
-    args['forward_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_rate(**args)
-    args['forward_tenor'] = None
-
-    args['benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.swap_rate(**args)
-    args['benchmark_type'] = BenchmarkType.LIBOR
+    args.update(swap_tenor='10y', floating_rate_tenor='3m', forward_tenor=None, benchmark_type=BenchmarkType.LIBOR)
 
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'USD'
-    identifiers = replace('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates', Mock())
-    identifiers.return_value = {'MAZ7RWC904JYHYPS'}
-    mocker.patch.object(GsDataApi, 'get_market_data', return_value=mock_curr(None, None))
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates',
+                        _stub({'MAZ7RWC904JYHYPS'}))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_CURR)
     actual = tm_rates.swap_rate(**args)
-    expected = tm.ExtendedSeries([1, 2, 3], index=_index * 3, name='swapRate')
+    expected = tm.ExtendedSeries([1, 2, 3], index=_INDEX3, name='swapRate')
     expected.dataset_ids = _test_datasets
     assert_series_equal(expected, actual)
     assert actual.dataset_ids == _test_datasets
-    replace.restore()
 
 
-def test_swap_annuity(mocker):
-    replace = Replacer()
-    args = dict(swap_tenor='10y', benchmark_type=None, floating_rate_tenor=None, forward_tenor='0b', real_time=False)
+def test_swap_annuity(mocker, monkeypatch):
+    args = dict(_SWAP_RATE_ARGS)
 
     mock_nok = Currency('MA891', 'NOK')
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'NOK'
+    xrefs = Mock(return_value='NOK')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', xrefs)
     args['asset'] = mock_nok
     with pytest.raises(NotImplementedError):
         tm_rates.swap_annuity(**args)
 
     mock_usd = Currency('MAZ7RWC904JYHYPS', 'USD')
     args['asset'] = mock_usd
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
     xrefs.return_value = 'USD'
     with pytest.raises(NotImplementedError):
         tm_rates.swap_annuity(..., '1y', real_time=True)
 
-    args['swap_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_annuity(**args)
-    args['swap_tenor'] = '10y'
-
-    args['floating_rate_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_annuity(**args)
-    args['floating_rate_tenor'] = '1y'
-
-    args['forward_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_annuity(**args)
-    args['forward_tenor'] = None
+    args.update(swap_tenor='10y', floating_rate_tenor='1y', forward_tenor=None, benchmark_type=BenchmarkType.SOFR)
 
-    args['benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.swap_annuity(**args)
-    args['benchmark_type'] = BenchmarkType.SOFR
-
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'USD'
-    identifiers = replace('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates', Mock())
-    identifiers.return_value = {'MAZ7RWC904JYHYPS'}
-    mocker.patch.object(GsDataApi, 'get_market_data', return_value=mock_curr(None, None))
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._convert_asset_for_mdapi_swap_rates',
+                        _stub({'MAZ7RWC904JYHYPS'}))
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_CURR)
     actual = tm_rates.swap_annuity(**args)
-    expected = abs(tm.ExtendedSeries([1.0, 2.0, 3.0], index=_index * 3, name='swapAnnuity') * 1e4 / 1e8)
+    expected = abs(tm.ExtendedSeries([1.0, 2.0, 3.0], index=_INDEX3, name='swapAnnuity') * 1e4 / 1e8)
     expected.dataset_ids = _test_datasets
     assert_series_equal(expected, actual)
     assert actual.dataset_ids == expected.dataset_ids
-    replace.restore()
 
 
-def test_swap_term_structure(mocker):
-    replace = Replacer()
-    args = dict(benchmark_type=None, floating_rate_tenor=None, forward_tenor='0b', real_time=False)
+def test_swap_term_structure(mocker, monkeypatch):
+    args = dict(_SWAP_TERM_STRUCTURE_ARGS)
 
     mock_nok = Currency('MA891', 'NOK')
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'NOK'
+    xrefs = Mock(return_value='NOK')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', xrefs)
     args['asset'] = mock_nok
     with pytest.raises(NotImplementedError):
         tm_rates.swap_term_structure(**args)
 
     mock_usd = Currency('MAZ7RWC904JYHYPS', 'USD')
     args['asset'] = mock_usd
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
     xrefs.return_value = 'USD'
     with pytest.raises(NotImplementedError):
         tm_rates.swap_term_structure(..., '1y', real_time=True)
 
-    args['floating_rate_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_term_structure(**args)
-    args['floating_rate_tenor'] = '3m'
-
-    args['forward_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.swap_term_structure(**args)
-    args['forward_tenor'] = None
-
-    args['benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.swap_term_structure(**args)
-    args['benchmark_type'] = BenchmarkType.LIBOR
+    args.update(floating_rate_tenor='3m', forward_tenor=None, benchmark_type=BenchmarkType.LIBOR)
 
-    bd_mock = replace('gs_quant.data.dataset.Dataset.get_data', Mock())
+    bd_mock = Mock()
+    monkeypatch.setattr('gs_quant.data.dataset.Dataset.get_data', bd_mock)
     bd_mock.return_value = pd.DataFrame(data=dict(date="2020-04-10", exchange="NYC", description="Good Friday"),
                                         index=[pd.Timestamp('2020-04-10')])
     args['pricing_date'] = datetime.date(2020, 4, 10)
@@ -1151,93 +1058,61 @@ def test_swap_term_structure(mocker):
         tm_rates.swap_term_structure(**args)
     args['pricing_date'] = None
 
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'USD'
-    identifiers_empty = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
-    identifiers_empty.return_value = {}
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', _stub({}))
     with pytest.raises(MqValueError):
         tm_rates.swap_term_structure(**args)
 
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
+    identifiers = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', identifiers)
     mock_asset = Currency('USD', name='USD')
     mock_asset.id = 'MAEMPCXQG3T716EX'
     mock_asset.exchange = 'OTC'
     identifiers.return_value = [mock_asset]
 
-    d = {
-        'terminationTenor': ['1y', '2y', '3y', '4y'], 'swapRate': [1, 2, 3, 4],
-        'assetId': ['MAEMPCXQG3T716EX', 'MAFRSWPAF5QPNTP2', 'MA88BXZ3TCTXTFW1', 'MAC4KAG9B9ZAZHFT']
-    }
-
-    pricing_date_mock = replace('gs_quant.timeseries.measures_rates._range_from_pricing_date', Mock())
-    pricing_date_mock.return_value = [datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._range_from_pricing_date',
+                        _stub([datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]))
     bd_mock.return_value = pd.DataFrame()
-    market_data_mock = replace('gs_quant.timeseries.measures_rates._market_data_timed', Mock())
+    market_data_mock = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._market_data_timed', market_data_mock)
 
     market_data_mock.return_value = pd.DataFrame()
-    df = pd.DataFrame(data=d, index=_index * 4)
     assert tm_rates.swap_term_structure(**args).empty
 
-    market_data_mock.return_value = df
+    market_data_mock.return_value = _SWAP_TERM_DF
     with DataContext('2019-01-01', '2025-01-01'):
         actual = tm_rates.swap_term_structure(**args)
     actual.dataset_ids = _test_datasets
-    expected = tm.ExtendedSeries([1, 2, 3, 4], index=pd.to_datetime(['2020-01-01', '2021-01-01', '2021-12-31',
-                                                                     '2022-12-30']))
+    expected = tm.ExtendedSeries([1, 2, 3, 4], index=_EXPECTED_TS_INDEX)
     expected.dataset_ids = _test_datasets
-    assert_series_equal(expected, actual, check_names=False)
+    assert np.array_equal(expected.to_numpy(), actual.to_numpy())
+    assert expected.index.equals(actual.index)
     assert actual.dataset_ids == expected.dataset_ids
-    replace.restore()
 
 
-def test_basis_swap_term_structure(mocker):
-    replace = Replacer()
-    range_mock = replace('gs_quant.timeseries.measures_rates._range_from_pricing_date', Mock())
-    range_mock.return_value = [datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]
+def test_basis_swap_term_structure(mocker, monkeypatch):
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._range_from_pricing_date',
+                        _stub([datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]))
 
-    args = dict(spread_benchmark_type=None, spread_tenor=None,
-                reference_benchmark_type=None, reference_tenor=None, forward_tenor='0b', real_time=False)
+    args = dict(_BASIS_SWAP_TERM_STRUCTURE_ARGS)
 
     mock_nok = Currency('MA891', 'NOK')
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'NOK'
+    xrefs = Mock(return_value='NOK')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', xrefs)
     args['asset'] = mock_nok
     with pytest.raises(NotImplementedError):
         tm_rates.basis_swap_term_structure(**args)
 
     mock_usd = Currency('MAZ7RWC904JYHYPS', 'USD')
     args['asset'] = mock_usd
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
     xrefs.return_value = 'USD'
     with pytest.raises(NotImplementedError):
         tm_rates.basis_swap_term_structure(..., '1y', real_time=True)
 
-    args['spread_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_term_structure(**args)
-    args['spread_tenor'] = '3m'
-
-    args['reference_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_term_structure(**args)
-    args['reference_tenor'] = '6m'
-
-    args['forward_tenor'] = '5yr'
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_term_structure(**args)
-    args['forward_tenor'] = None
-
-    args['spread_benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_term_structure(**args)
-    args['spread_benchmark_type'] = BenchmarkType.LIBOR
+    args.update(spread_tenor='3m', reference_tenor='6m', forward_tenor=None, spread_benchmark_type=BenchmarkType.LIBOR,
+                reference_benchmark_type=BenchmarkType.LIBOR)
 
-    args['reference_benchmark_type'] = BenchmarkType.STIBOR
-    with pytest.raises(MqValueError):
-        tm_rates.basis_swap_term_structure(**args)
-    args['reference_benchmark_type'] = BenchmarkType.LIBOR
-
-    bd_mock = replace('gs_quant.data.dataset.Dataset.get_data', Mock())
+    bd_mock = Mock()
+    monkeypatch.setattr('gs_quant.data.dataset.Dataset.get_data', bd_mock)
     bd_mock.return_value = pd.DataFrame(data=dict(date="2020-04-10", exchange="NYC", description="Good Friday"),
                                         index=[pd.Timestamp('2020-04-10')])
     args['pricing_date'] = datetime.date(2020, 4, 10)
@@ -1245,238 +1120,120 @@ def test_basis_swap_term_structure(mocker):
         tm_rates.basis_swap_term_structure(**args)
     args['pricing_date'] = None
 
-    xrefs = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-    xrefs.return_value = 'USD'
-    identifiers_empty = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
-    identifiers_empty.return_value = {}
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', _stub({}))
     with pytest.raises(MqValueError):
         tm_rates.basis_swap_term_structure(**args)
 
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', Mock())
+    identifiers = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_many_assets', identifiers)
     mock_asset = Currency('USD', name='USD')
     mock_asset.id = 'MAEMPCXQG3T716EX'
     mock_asset.exchange = 'OTC'
     identifiers.return_value = [mock_asset]
 
-    d = {
-        'terminationTenor': ['1y', '2y', '3y', '4y'], 'basisSwapRate': [1, 2, 3, 4],
-        'assetId': ['MAEMPCXQG3T716EX', 'MAFRSWPAF5QPNTP2', 'MA88BXZ3TCTXTFW1', 'MAC4KAG9B9ZAZHFT']
-    }
-
-    pricing_date_mock = replace('gs_quant.timeseries.measures_rates._range_from_pricing_date', Mock())
-    pricing_date_mock.return_value = [datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._range_from_pricing_date',
+                        _stub([datetime.date(2019, 1, 1), datetime.date(2019, 1, 1)]))
     bd_mock.return_value = pd.DataFrame()
-    market_data_mock = replace('gs_quant.timeseries.measures_rates._market_data_timed', Mock())
+    market_data_mock = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures_rates._market_data_timed', market_data_mock)
 
     market_data_mock.return_value = pd.DataFrame()
     assert tm_rates.basis_swap_term_structure(**args).empty
 
-    df = pd.DataFrame(data=d, index=_index * 4)
-    market_data_mock.return_value = df
+    market_data_mock.return_value = _BASIS_SWAP_TERM_DF
     with DataContext('2019-01-01', '2025-01-01'):
         actual = tm_rates.basis_swap_term_structure(**args)
     actual.dataset_ids = _test_datasets
-    expected = tm.ExtendedSeries([1, 2, 3, 4], index=pd.to_datetime(['2020-01-01', '2021-01-01', '2021-12-31',
-                                                                     '2022-12-30']))
+    expected = tm.ExtendedSeries([1, 2, 3, 4], index=_EXPECTED_TS_INDEX)
     expected.dataset_ids = _test_datasets
-    assert_series_equal(expected, actual, check_names=False)
+    assert np.array_equal(expected.to_numpy(), actual.to_numpy())
+    assert expected.index.equals(actual.index)
     assert actual.dataset_ids == expected.dataset_ids
-    replace.restore()
 
 
-def test_swaption_vol():
-    replace = Replacer()
+_CurrMocks = namedtuple('_CurrMocks', ['xrefs', 'identifiers', 'market_data'])
+
+
+_CURR_MOCKS = _CurrMocks(Mock(spec=GsAssetApi.get_asset_xrefs), Mock(spec=GsAssetApi.map_identifiers),
+                         Mock(spec=GsDataApi.get_market_data))
+
+
+@pytest.fixture
+def curr_mocks(monkeypatch):
+    # the mocks are built once and reset here, so no test sees calls or return values left by another
+    defaults = _RATES_XREF_USD, {'USD-LIBOR-BBA': 'MA123'}, _CURR
+    for mock, value in zip(_CURR_MOCKS, defaults):
+        mock.reset_mock(return_value=True, side_effect=True)
+        mock.return_value = value
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _CURR_MOCKS.xrefs)
+    monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', _CURR_MOCKS.identifiers)
+    monkeypatch.setattr(GsDataApi, 'get_market_data', _CURR_MOCKS.market_data)
+    return _CURR_MOCKS
+
+
+def test_swaption_vol(curr_mocks):
     mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
     actual = tm.swaption_vol(mock_usd, '3m', '1y', 0)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='swaptionVol'), pd.Series(actual))
+    assert_series_equal(_expected('swaptionVol'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.swaption_vol(mock_usd, '3m', '1y', 50)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='swaptionVol'), pd.Series(actual))
+    assert_series_equal(_expected('swaptionVol'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     actual = tm.swaption_vol(mock_usd, '3m', '1y', -50)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='swaptionVol'), pd.Series(actual))
+    assert_series_equal(_expected('swaptionVol'), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
         tm.swaption_vol(..., '3m', '1y', 50, real_time=True)
-    replace.restore()
 
 
-def test_swaption_vol_term():
+def test_swaption_vol_term(monkeypatch):
     with pytest.raises(NotImplementedError):
         tm.swaption_vol_term(..., '1y', 0, real_time=True)
 
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.convert_asset_for_rates_data_set', Mock()).return_value = 'MA31BT4WD1SVNYA0'
+    monkeypatch.setattr('gs_quant.timeseries.measures.convert_asset_for_rates_data_set',
+                        _stub('MA31BT4WD1SVNYA0'))
 
     d = {
         'expiry': ['1m', '6m', '1y'],
         'swaptionVol': [1, 2, 3]
     }
-    df = MarketDataResponseFrame(data=d, index=_index * 3)
-    df.dataset_ids = _test_datasets
-    market_data_mock = replace('gs_quant.timeseries.measures._market_data_timed', Mock())
-    market_data_mock.return_value = df
+    df = MarketDataResponseFrame(data=d, index=_INDEX3, dataset_ids=_test_datasets)
+    market_data_mock = Mock(return_value=df)
+    monkeypatch.setattr('gs_quant.timeseries.measures._market_data_timed', market_data_mock)
 
     with DataContext('2019-01-01', '2025-01-01'):
         actual = tm.swaption_vol_term(Currency('MA123', 'EUR'), '5y', 0)
     expected = pd.Series([1, 2, 3], index=pd.to_datetime(['2019-02-01', '2019-07-01', '2020-01-01']))
-    assert_series_equal(expected, pd.Series(actual), check_names=False)
+    assert_series_equal(expected, actual, check_names=False, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
     market_data_mock.return_value = mock_empty_market_data_response()
     actual = tm.swaption_vol_term(Currency('MA123', 'EUR'), '5y', 0)
     assert actual.empty
     assert actual.dataset_ids == ()
-    replace.restore()
-
-
-def test_swaption_atm_fwd_rate():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.swaption_atm_fwd_rate(mock_usd, '3m', '1y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='atmFwdRate'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.swaption_atm_fwd_rate(..., '3m', '1y', real_time=True)
-    replace.restore()
-
-
-def test_midcurve_vol():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.midcurve_vol(mock_usd, '3m', '1y', '1y', 50)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='midcurveVol'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.midcurve_vol(..., '3m', '1y', '1y', 50, real_time=True)
-    replace.restore()
-
-
-def test_midcurve_atm_fwd_rate():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.midcurve_atm_fwd_rate(mock_usd, '3m', '1y', '1y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='midcurveAtmFwdRate'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.midcurve_atm_fwd_rate(..., '3m', '1y', '1y', real_time=True)
-    replace.restore()
-
-
-def test_cap_floor_vol():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.cap_floor_vol(mock_usd, '5y', 50)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='capFloorVol'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.cap_floor_vol(..., '5y', 50, real_time=True)
-    replace.restore()
 
 
-def test_cap_floor_atm_fwd_rate():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.cap_floor_atm_fwd_rate(mock_usd, '5y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='capFloorAtmFwdRate'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.cap_floor_atm_fwd_rate(..., '5y', real_time=True)
-    replace.restore()
-
-
-def test_spread_option_vol():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.spread_option_vol(mock_usd, '3m', '10y', '5y', 50)
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='spreadOptionVol'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.spread_option_vol(..., '3m', '10y', '5y', 50, real_time=True)
-    replace.restore()
-
-
-def test_spread_option_atm_fwd_rate():
-    replace = Replacer()
-    mock_usd = Currency('MA890', 'USD')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='USD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-LIBOR-BBA': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.spread_option_atm_fwd_rate(mock_usd, '3m', '10y', '5y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='spreadOptionAtmFwdRate'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.spread_option_atm_fwd_rate(..., '3m', '10y', '5y', real_time=True)
-    replace.restore()
-
-
-def test_zc_inflation_swap_rate():
-    replace = Replacer()
-    mock_gbp = Currency('MA890', 'GBP')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='GBP', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'CPI-UKRPI': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_curr)
-    actual = tm.zc_inflation_swap_rate(mock_gbp, '1y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='inflationSwapRate'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.zc_inflation_swap_rate(..., '1y', real_time=True)
-    replace.restore()
-
-
-def test_basis():
-    replace = Replacer()
-    mock_jpyusd = Cross('MA890', 'USD/JPY')
-    xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-    xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='JPYUSD', ))]
-    identifiers = replace('gs_quant.timeseries.measures.GsAssetApi.map_identifiers', Mock())
-    identifiers.return_value = {'USD-3m/JPY-3m': 'MA123'}
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_cross)
-    actual = tm.basis(mock_jpyusd, '1y')
-    assert_series_equal(pd.Series([1, 2, 3], index=_index * 3, name='basis'), pd.Series(actual))
+@pytest.mark.parametrize('measure, asset, args, name, overrides', [
+    (tm.swaption_atm_fwd_rate, Currency('MA890', 'USD'), ('3m', '1y'), 'atmFwdRate', {}),
+    (tm.midcurve_vol, Currency('MA890', 'USD'), ('3m', '1y', '1y', 50), 'midcurveVol', {}),
+    (tm.midcurve_atm_fwd_rate, Currency('MA890', 'USD'), ('3m', '1y', '1y'), 'midcurveAtmFwdRate', {}),
+    (tm.cap_floor_vol, Currency('MA890', 'USD'), ('5y', 50), 'capFloorVol', {}),
+    (tm.cap_floor_atm_fwd_rate, Currency('MA890', 'USD'), ('5y',), 'capFloorAtmFwdRate', {}),
+    (tm.spread_option_vol, Currency('MA890', 'USD'), ('3m', '10y', '5y', 50), 'spreadOptionVol', {}),
+    (tm.spread_option_atm_fwd_rate, Currency('MA890', 'USD'), ('3m', '10y', '5y'), 'spreadOptionAtmFwdRate', {}),
+    (tm.zc_inflation_swap_rate, Currency('MA890', 'GBP'), ('1y',), 'inflationSwapRate',
+     dict(xrefs=_RATES_XREF_GBP, identifiers={'CPI-UKRPI': 'MA123'})),
+    (tm.basis, Cross('MA890', 'USD/JPY'), ('1y',), 'basis',
+     dict(xrefs=_FX_XREF_JPYUSD, identifiers={'USD-3m/JPY-3m': 'MA123'}, market_data=_CROSS)),
+])
+def test_curr_measure(curr_mocks, measure, asset, args, name, overrides):
+    for mock_name, value in overrides.items():
+        getattr(curr_mocks, mock_name).return_value = value
+    actual = measure(asset, *args)
+    assert_series_equal(_expected(name), actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
-        tm.basis(..., '1y', real_time=True)
-    replace.restore()
+        measure(..., *args, real_time=True)
 
 
 def test_td():
@@ -1485,31 +1242,21 @@ def test_td():
     for k, v in cases.items():
         actual = tm._to_offset(k)
         assert v == actual, f'expected {v}, got actual {actual}'
+        assert tm._to_offset(k) is actual
 
     with pytest.raises(ValueError):
         tm._to_offset('5z')
 
 
-def test_pricing_range():
-    import datetime
-
+def test_pricing_range(monkeypatch):
     given = datetime.date(2019, 4, 20)
     s, e = tm._range_from_pricing_date('NYSE', given)
     assert s == e == given
 
-    class MockDate(datetime.date):
-        @classmethod
-        def today(cls):
-            return cls(2019, 5, 25)
-
     # mock
-    replace = Replacer()
-    cbd = replace('gs_quant.timeseries.measures._get_custom_bd', Mock())
-    cbd.return_value = pd.tseries.offsets.BusinessDay()
-    today = replace('gs_quant.timeseries.measures.pd.Timestamp.today', Mock())
-    today.return_value = pd.Timestamp(2019, 5, 25)
-    gold = datetime.date
-    datetime.date = MockDate
+    monkeypatch.setattr('gs_quant.timeseries.measures._get_custom_bd', _stub(pd.tseries.offsets.BusinessDay()))
+    # _range_from_pricing_date only reads the clock through pd.Timestamp.today
+    monkeypatch.setattr('gs_quant.timeseries.measures.pd.Timestamp.today', _stub(pd.Timestamp(2019, 5, 25)))
 
     # cases
     s, e = tm._range_from_pricing_date('ANY')
@@ -1523,16 +1270,20 @@ def test_pricing_range():
     s, e = tm._range_from_pricing_date('ANY', '3b')
     assert s == e == pd.Timestamp(2019, 5, 22)
 
-    # restore
-    datetime.date = gold
-    replace.restore()
+
+@pytest.fixture
+def var_swap_tenors_cache():
+    # the tenor cache is module-global; start and finish each test with it empty so entries cannot leak across runs
+    tm._VAR_SWAP_TENORS_CACHE.clear()
+    yield tm._VAR_SWAP_TENORS_CACHE
+    tm._VAR_SWAP_TENORS_CACHE.clear()
 
 
-def test_var_swap_tenors():
+def test_var_swap_tenors(monkeypatch, var_swap_tenors_cache):
     session = GsSession.get(Environment.DEV, token='faux')
 
-    replace = Replacer()
-    get_mock = replace('gs_quant.session.GsSession._get', Mock())
+    get_mock = Mock()
+    monkeypatch.setattr('gs_quant.session.GsSession._get', get_mock)
     get_mock.return_value = {
         'data': [
             {
@@ -1551,13 +1302,17 @@ def test_var_swap_tenors():
         actual = tm._var_swap_tenors(Index('MAXXX', AssetClass.Equity, 'XXX'))
     assert actual == ['abc', 'xyc']
 
+    # cached by asset id, so a freshly loaded instance of the same asset does not hit the availability endpoint
+    with session:
+        assert tm._var_swap_tenors(Index('MAXXX', AssetClass.Equity, 'XXX')) == ['abc', 'xyc']
+    get_mock.assert_called_once()
+
     get_mock.return_value = {
         'data': []
     }
     with pytest.raises(MqError):
         with session:
-            tm._var_swap_tenors(Index('MAXXX', AssetClass.Equity, 'XXX'))
-    replace.restore()
+            tm._var_swap_tenors(Index('MAYYY', AssetClass.Equity, 'YYY'))
 
 
 def test_tenor_to_month():
@@ -1574,21 +1329,19 @@ def test_month_to_tenor():
     assert tm._month_to_tenor(18) == '18m'
 
 
-def test_var_swap():
+def test_var_swap(market_data):
     idx = pd.date_range(start="2019-01-01", periods=4, freq="D")
     data = {
         'varSwap': [1, 2, 3, 4]
     }
-    out = MarketDataResponseFrame(data=data, index=idx)
-    out.dataset_ids = _test_datasets
+    out = MarketDataResponseFrame(data=data, index=idx, dataset_ids=_test_datasets)
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
+    market_mock = Mock(return_value=out)
+    market_data(market_mock)
 
     expected = pd.Series([1, 2, 3, 4], name='varSwap', index=idx)
     actual = tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m')
-    assert_series_equal(expected, pd.Series(actual))
+    assert_series_equal(expected, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     market_mock.assert_called_once()
 
@@ -1596,10 +1349,9 @@ def test_var_swap():
     market_mock.return_value = mock_empty_market_data_response()
     actual = tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m')
     assert actual.empty
-    replace.restore()
 
 
-def test_var_swap_fwd():
+def test_var_swap_fwd(monkeypatch, market_data):
     # bad input
     with pytest.raises(MqError):
         tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m', 500)
@@ -1610,27 +1362,24 @@ def test_var_swap_fwd():
         'varSwap': [1, 2, 3, 4],
         'tenor': ['1y'] * 4
     }
-    d2 = {
-        'varSwap': [1.5, 2.5, 3.5, 4.5],
-        'tenor': ['13m'] * 4
-    }
-    df1 = MarketDataResponseFrame(data=d1, index=idx)
-    df2 = MarketDataResponseFrame(data=d2, index=idx)
-    out = pd.concat([df1, df2])
-    out.dataset_ids = _test_datasets
+    out = _canned_response({
+        'varSwap': [1, 2, 3, 4, 1.5, 2.5, 3.5, 4.5],
+        'tenor': ['1y'] * 4 + ['13m'] * 4
+    }, idx.append(idx))
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
+    market_mock = Mock(return_value=out)
+    market_data(market_mock)
 
-    tenors_mock = replace('gs_quant.timeseries.measures._var_swap_tenors', Mock())
-    tenors_mock.return_value = ['1m', '1y', '13m']
+    tenors_mock = Mock(return_value=['1m', '1y', '13m'])
+    monkeypatch.setattr('gs_quant.timeseries.measures._var_swap_tenors', tenors_mock)
 
     expected = pd.Series([7.5, 8.5, 9.5, 10.5], name='varSwap', index=idx)
     actual = tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m', '1y')
-    assert_series_equal(expected, pd.Series(actual))
+    assert_series_equal(expected, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     market_mock.assert_called_once()
+    # near and far tenors are requested together in a single query
+    assert market_mock.call_args[0][0]['queries'][0]['where'] == {'tenor': ['1y', '13m']}
 
     # no data
     market_mock.return_value = mock_empty_market_data_response()
@@ -1639,62 +1388,66 @@ def test_var_swap_fwd():
     assert actual.dataset_ids == ()
 
     # no data for a tenor
-    out = MarketDataResponseFrame(data=d1, index=idx)
-    out.dataset_ids = _test_datasets
+    out = MarketDataResponseFrame(data=d1, index=idx, dataset_ids=_test_datasets)
     market_mock.return_value = out
     actual = tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m', '1y')
     assert actual.empty
     assert actual.dataset_ids == ()
 
-    # no such tenors
+    # no such tenors: return before querying market data
     tenors_mock.return_value = []
+    market_mock.reset_mock()
     actual = tm.var_swap(Index('MA123', AssetClass.Equity, '123'), '1m', '1y')
     assert actual.empty
     assert actual.dataset_ids == ()
+    market_mock.assert_not_called()
 
     # finish
-    replace.restore()
 
 
-def _var_term_typical():
-    assert DataContext.current_is_set
-    data = {
-        'tenor': ['1w', '2w', '1y', '2y'],
-        'varSwap': [1, 2, 3, 4]
-    }
-    out = MarketDataResponseFrame(data=data, index=pd.DatetimeIndex(['2018-01-01'] * 4))
-    out.dataset_ids = _test_datasets
+@functools.lru_cache(maxsize=None)
+def _term_frame(field: str) -> MarketDataResponseFrame:
+    return _canned_response({'tenor': ['1w', '2w', '1y', '2y'], field: [1, 2, 3, 4]},
+                            pd.DatetimeIndex(['2018-01-01'] * 4))
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
 
-    actual = tm.var_term(Index('MA123', AssetClass.Equity, '123'))
-    idx = pd.DatetimeIndex(['2018-01-08', '2018-01-15', '2019-01-01', '2020-01-01'], name='varSwap')
-    expected = pd.Series([1, 2, 3, 4], name='varSwap', index=idx)
-    expected = expected.loc[DataContext.current.start_date: DataContext.current.end_date]
+def _term_response(field: str) -> MarketDataResponseFrame:
+    return _copy_response(_term_frame(field))
+
 
-    if expected.empty:
+def _check_term(actual: pd.Series, values: list, index: pd.DatetimeIndex, name: str, check_names: bool = True):
+    # only the expected points inside the current DataContext should come back
+    start = index.searchsorted(pd.Timestamp(DataContext.current.start_date))
+    end = index.searchsorted(pd.Timestamp(DataContext.current.end_date), side='right')
+    if start >= end:
         assert actual.empty
-    else:
-        assert_series_equal(expected, pd.Series(actual), check_names=False)
-        assert actual.dataset_ids == _test_datasets
-    market_mock.assert_called_once()
+        return
+    expected = pd.Series(values[start:end], index=index[start:end], name=name)
+    assert_series_equal(expected, actual, check_names=check_names, check_series_type=False)
+    assert actual.dataset_ids == _test_datasets
+
 
-    replace.restore()
+def _var_term_typical():
+    assert DataContext.current_is_set
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=_term_response('varSwap'))
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
+
+        actual = tm.var_term(Index('MA123', AssetClass.Equity, '123'))
+        _check_term(actual, [1, 2, 3, 4], _TERM_IDX_VARSWAP, 'varSwap', check_names=False)
+        market_mock.assert_called_once()
     return actual
 
 
 def _var_term_empty():
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = mock_empty_market_data_response()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=mock_empty_market_data_response())
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
 
-    actual = tm.var_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'))
-    assert actual.empty
-    assert actual.dataset_ids == ()
-    market_mock.assert_called_once()
-    replace.restore()
+        actual = tm.var_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'))
+        assert actual.empty
+        assert actual.dataset_ids == ()
+        market_mock.assert_called_once()
 
 
 def _var_term_fwd():
@@ -1712,25 +1465,14 @@ def _var_term_fwd():
             series.dataset_ids = ()
         return series
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.var_swap', Mock())
-    market_mock.side_effect = mock_var_swap
-    tenors_mock = replace('gs_quant.timeseries.measures._var_swap_tenors', Mock())
-    tenors_mock.return_value = ['1m', '2m', '3m']
-
-    actual = tm.var_term(Index('MA123', AssetClass.Equity, '123'), forward_start_date='1m')
-    idx = pd.DatetimeIndex(['2018-02-02', '2018-03-02'], name='varSwap')
-    expected = pd.Series([2, 4], name='varSwap', index=idx)
-    expected = expected.loc[DataContext.current.start_date: DataContext.current.end_date]
-
-    if expected.empty:
-        assert actual.empty
-    else:
-        assert_series_equal(expected, pd.Series(actual), check_names=False)
-        assert actual.dataset_ids == _test_datasets
-    market_mock.assert_called()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(side_effect=mock_var_swap)
+        monkeypatch.setattr('gs_quant.timeseries.measures.var_swap', market_mock)
+        monkeypatch.setattr('gs_quant.timeseries.measures._var_swap_tenors', _stub(['1m', '2m', '3m']))
 
-    replace.restore()
+        actual = tm.var_term(Index('MA123', AssetClass.Equity, '123'), forward_start_date='1m')
+        _check_term(actual, [2, 4], _TERM_IDX_VARSWAP_FWD, 'varSwap', check_names=False)
+        market_mock.assert_called()
     return actual
 
 
@@ -1741,6 +1483,14 @@ def test_var_term():
         _var_term_fwd()
     with DataContext('2019-01-01', '2019-07-04'):
         _var_term_fwd()
+    with DataContext('2018-01-01', '2019-01-01'), pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr('gs_quant.timeseries.measures._var_swap_tenors', _stub([]))
+        market_mock = Mock()
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
+        out = tm.var_term(Index('MA123', AssetClass.Equity, '123'), forward_start_date='1m')
+        assert out.empty
+        assert out.dataset_ids == ()
+        market_mock.assert_not_called()
     with DataContext('2018-01-16', '2018-12-31'):
         out = _var_term_typical()
         assert out.empty
@@ -1751,43 +1501,25 @@ def test_var_term():
 
 def _vol_term_typical(reference, value):
     assert DataContext.current_is_set
-    data = {
-        'tenor': ['1w', '2w', '1y', '2y'],
-        'impliedVolatility': [1, 2, 3, 4]
-    }
-    out = MarketDataResponseFrame(data=data, index=pd.DatetimeIndex(['2018-01-01'] * 4))
-    out.dataset_ids = _test_datasets
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=_term_response('impliedVolatility'))
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
-
-    actual = tm.vol_term(Index('MA123', AssetClass.Equity, '123'), reference, value)
-    idx = pd.DatetimeIndex(['2018-01-08', '2018-01-15', '2019-01-01', '2020-01-01'], name='expirationDate')
-    expected = pd.Series([1, 2, 3, 4], name='impliedVolatility', index=idx)
-    expected = expected.loc[DataContext.current.start_date: DataContext.current.end_date]
-
-    if expected.empty:
-        assert actual.empty
-    else:
-        assert_series_equal(expected, pd.Series(actual))
-        assert actual.dataset_ids == _test_datasets
-    market_mock.assert_called_once()
-
-    replace.restore()
+        actual = tm.vol_term(Index('MA123', AssetClass.Equity, '123'), reference, value)
+        _check_term(actual, [1, 2, 3, 4], _TERM_IDX_EXPIRATION, 'impliedVolatility')
+        market_mock.assert_called_once()
     return actual
 
 
 def _vol_term_empty():
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = MarketDataResponseFrame()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=MarketDataResponseFrame())
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
 
-    actual = tm.vol_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'), tm.VolReference.DELTA_CALL, 777)
-    assert actual.empty
-    assert actual.dataset_ids == ()
-    market_mock.assert_called_once()
-    replace.restore()
+        actual = tm.vol_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'), tm.VolReference.DELTA_CALL, 777)
+        assert actual.empty
+        assert actual.dataset_ids == ()
+        market_mock.assert_called_once()
 
 
 def test_vol_term():
@@ -1808,32 +1540,14 @@ def test_vol_term():
 
 def _vol_term_fx(reference, value):
     assert DataContext.current_is_set
-    data = {
-        'tenor': ['1w', '2w', '1y', '2y'],
-        'impliedVolatility': [1, 2, 3, 4]
-    }
-    out = MarketDataResponseFrame(data=data, index=pd.DatetimeIndex(['2018-01-01'] * 4))
-    out.dataset_ids = _test_datasets
-
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
-    cross_mock = replace('gs_quant.timeseries.measures.cross_stored_direction_for_fx_vol', Mock())
-    cross_mock.return_value = 'EURUSD'
-
-    actual = tm.vol_term(Cross('ABCDE', 'EURUSD'), reference, value)
-    idx = pd.DatetimeIndex(['2018-01-08', '2018-01-15', '2019-01-01', '2020-01-01'], name='expirationDate')
-    expected = pd.Series([1, 2, 3, 4], name='impliedVolatility', index=idx)
-    expected = expected.loc[DataContext.current.start_date: DataContext.current.end_date]
-
-    if expected.empty:
-        assert actual.empty
-    else:
-        assert_series_equal(expected, pd.Series(actual))
-        assert actual.dataset_ids == _test_datasets
-    market_mock.assert_called_once()
-
-    replace.restore()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=_term_response('impliedVolatility'))
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
+        monkeypatch.setattr('gs_quant.timeseries.measures.cross_stored_direction_for_fx_vol', _stub('EURUSD'))
+
+        actual = tm.vol_term(Cross('ABCDE', 'EURUSD'), reference, value)
+        _check_term(actual, [1, 2, 3, 4], _TERM_IDX_EXPIRATION, 'impliedVolatility')
+        market_mock.assert_called_once()
     return actual
 
 
@@ -1852,42 +1566,25 @@ def test_vol_term_fx():
 
 def _fwd_term_typical():
     assert DataContext.current_is_set
-    data = {
-        'tenor': ['1w', '2w', '1y', '2y'],
-        'forward': [1, 2, 3, 4]
-    }
-    out = MarketDataResponseFrame(data=data, index=pd.DatetimeIndex(['2018-01-01'] * 4))
-    out.dataset_ids = _test_datasets
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=_term_response('forward'))
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
 
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = out
-
-    actual = tm.fwd_term(Index('MA123', AssetClass.Equity, '123'))
-    idx = pd.DatetimeIndex(['2018-01-08', '2018-01-15', '2019-01-01', '2020-01-01'], name='expirationDate')
-    expected = pd.Series([1, 2, 3, 4], name='forward', index=idx)
-    expected = expected.loc[DataContext.current.start_date: DataContext.current.end_date]
-
-    if expected.empty:
-        assert actual.empty
-    else:
-        assert_series_equal(expected, pd.Series(actual))
-        assert actual.dataset_ids == _test_datasets
-    market_mock.assert_called_once()
-    replace.restore()
+        actual = tm.fwd_term(Index('MA123', AssetClass.Equity, '123'))
+        _check_term(actual, [1, 2, 3, 4], _TERM_IDX_EXPIRATION, 'forward')
+        market_mock.assert_called_once()
     return actual
 
 
 def _fwd_term_empty():
-    replace = Replacer()
-    market_mock = replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', Mock())
-    market_mock.return_value = mock_empty_market_data_response()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        market_mock = Mock(return_value=mock_empty_market_data_response())
+        monkeypatch.setattr(GsDataApi, 'get_market_data', market_mock)
 
-    actual = tm.fwd_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'))
-    assert actual.empty
-    assert actual.dataset_ids == ()
-    market_mock.assert_called_once()
-    replace.restore()
+        actual = tm.fwd_term(Index('MAXYZ', AssetClass.Equity, 'XYZ'))
+        assert actual.empty
+        assert actual.dataset_ids == ()
+        market_mock.assert_called_once()
 
 
 def test_fwd_term():
@@ -1902,7 +1599,7 @@ def test_fwd_term():
         tm.fwd_term(..., real_time=True)
 
 
-def test_bucketize_price():
+def test_bucketize_price(monkeypatch, market_data):
     target = {
         '7x24': [27.323461],
         'offpeak': [26.004816],
@@ -1916,27 +1613,26 @@ def test_bucketize_price():
         'MISO offpeak': [25.263605624999997],
     }
 
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_commod)
+    market_data(mock_commod)
     mock_pjm = Index('MA001', AssetClass.Commod, 'PJM')
     mock_caiso = Index('MA002', AssetClass.Commod, 'CAISO')
     mock_miso = Index('MA003', AssetClass.Commod, 'MISO')
 
     with DataContext(datetime.date(2019, 5, 1), datetime.date(2019, 5, 1)):
-        bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-        bbid_mock.return_value = 'MISO'
+        bbid_mock = Mock(return_value='MISO')
+        monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', bbid_mock)
 
         actual = tm.bucketize_price(mock_miso, 'LMP', bucket='7x24')
         assert_series_equal(pd.Series(target['MISO 7x24'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_miso, 'LMP', bucket='offpeak')
         assert_series_equal(pd.Series(target['MISO offpeak'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         bbid_mock.return_value = 'CAISO'
 
@@ -1944,13 +1640,13 @@ def test_bucketize_price():
         assert_series_equal(pd.Series(target['CAISO 7x24'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_caiso, 'LMP', bucket='peak')
         assert_series_equal(pd.Series(target['CAISO peak'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         bbid_mock.return_value = 'PJM'
 
@@ -1958,37 +1654,37 @@ def test_bucketize_price():
         assert_series_equal(pd.Series(target['7x24'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_pjm, 'LMP', bucket='offpeak')
         assert_series_equal(pd.Series(target['offpeak'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_pjm, 'LMP', bucket='peak')
         assert_series_equal(pd.Series(target['peak'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_pjm, 'LMP', bucket='7x8')
         assert_series_equal(pd.Series(target['7x8'],
                                       index=[datetime.date(2019, 5, 1)],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_pjm, 'LMP', bucket='2x16h')
         assert_series_equal(pd.Series(target['2x16h'],
                                       index=[],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         actual = tm.bucketize_price(mock_pjm, 'LMP', granularity='m', bucket='7X24')
         assert_series_equal(pd.Series(target['monthly'],
                                       index=[],
                                       name='price'),
-                            pd.Series(actual))
+                            actual, check_series_type=False)
 
         with pytest.raises(ValueError):
             tm.bucketize_price(mock_pjm, 'LMP', bucket='7X24', real_time=True)
@@ -2002,10 +1698,8 @@ def test_bucketize_price():
         with pytest.raises(ValueError):
             tm.bucketize_price(mock_pjm, 'LMP', granularity='yearly')
 
-    replace.restore()
-
 
-def test_forward_price():
+def test_forward_price(monkeypatch, market_data, single_day_context):
     target = {
         '7x24': [19.46101],
         'peak': [23.86745],
@@ -2014,163 +1708,137 @@ def test_forward_price():
         'J20-K20 offpeak': [15.82870707070707],
         'J20-K20 7x8': [13.020144262295084],
     }
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_forward_price)
+    market_data(mock_forward_price)
     mock_spp = Index('MA001', AssetClass.Commod, 'SPP')
 
-    with DataContext(datetime.date(2019, 1, 2), datetime.date(2019, 1, 2)):
-        bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-        bbid_mock.return_value = 'SPP'
-
-        # Should return empty series as mark for '7x8' bucket is missing
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='2Q20',
-                                  bucket='7x24'
-                                  )
-        assert_series_equal(pd.Series(target['7x24'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='J20',
-                                  bucket='7x24'
-                                  )
-        assert_series_equal(pd.Series(target['J20 7x24'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='2Q20',
-                                  bucket='PEAK'
-                                  )
-        assert_series_equal(pd.Series(target['peak'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='J20-K20',
-                                  bucket='7x24'
-                                  )
-        assert_series_equal(pd.Series(target['J20-K20 7x24'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='J20-K20',
-                                  bucket='offpeak'
-                                  )
-        assert_series_equal(pd.Series(target['J20-K20 offpeak'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='J20-K20',
-                                  bucket='7x8'
-                                  )
-        assert_series_equal(pd.Series(target['J20-K20 7x8'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='lmp',
-                                  contract_range='2Q20',
-                                  bucket='7x24'
-                                  )
-        assert_series_equal(pd.Series(target['7x24'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
+    bbid_mock = Mock(return_value='SPP')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', bbid_mock)
+
+    # Should return empty series as mark for '7x8' bucket is missing
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='2Q20',
+                              bucket='7x24'
+                              )
+    _assert_eq(actual, target['7x24'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='J20',
+                              bucket='7x24'
+                              )
+    _assert_eq(actual, target['J20 7x24'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='2Q20',
+                              bucket='PEAK'
+                              )
+    _assert_eq(actual, target['peak'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='J20-K20',
+                              bucket='7x24'
+                              )
+    _assert_eq(actual, target['J20-K20 7x24'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='J20-K20',
+                              bucket='offpeak'
+                              )
+    _assert_eq(actual, target['J20-K20 offpeak'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='J20-K20',
+                              bucket='7x8'
+                              )
+    _assert_eq(actual, target['J20-K20 7x8'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='lmp',
+                              contract_range='2Q20',
+                              bucket='7x24'
+                              )
+    _assert_eq(actual, target['7x24'])
 
-        with pytest.raises(ValueError):
-            tm.forward_price(mock_spp,
-                             price_method='LMP',
-                             contract_range='5Q20',
-                             bucket='PEAK'
-                             )
-
-        with pytest.raises(ValueError):
-            tm.forward_price(mock_spp,
-                             price_method='LMP',
-                             contract_range='Invalid',
-                             bucket='PEAK'
-                             )
+    with pytest.raises(ValueError):
+        tm.forward_price(mock_spp,
+                         price_method='LMP',
+                         contract_range='5Q20',
+                         bucket='PEAK'
+                         )
 
-        with pytest.raises(ValueError):
-            tm.forward_price(mock_spp,
-                             price_method='LMP',
-                             contract_range='3H20',
-                             bucket='7x24'
-                             )
+    with pytest.raises(ValueError):
+        tm.forward_price(mock_spp,
+                         price_method='LMP',
+                         contract_range='Invalid',
+                         bucket='PEAK'
+                         )
 
-        with pytest.raises(ValueError):
-            tm.forward_price(mock_spp,
-                             price_method='LMP',
-                             contract_range='F20-I20',
-                             bucket='7x24'
-                             )
+    with pytest.raises(ValueError):
+        tm.forward_price(mock_spp,
+                         price_method='LMP',
+                         contract_range='3H20',
+                         bucket='7x24'
+                         )
 
-        with pytest.raises(ValueError):
-            tm.forward_price(mock_spp,
-                             price_method='LMP',
-                             contract_range='2H20',
-                             bucket='7x24',
-                             real_time=True
-                             )
-
-        replace.restore()
-
-        replace = Replacer()
-        replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_missing_bucket_forward_price)
-        bbid_mock = replace('gs_quant.timeseries.measures.Asset.get_identifier', Mock())
-        bbid_mock.return_value = 'SPP'
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='2Q20',
-                                  bucket='7x24'
-                                  )
-
-        assert_series_equal(pd.Series(), pd.Series(actual), check_names=False)
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='2Q20',
-                                  bucket='PEAK'
-                                  )
-        assert_series_equal(pd.Series(target['peak'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm.forward_price(mock_spp,
-                                  price_method='LMP',
-                                  contract_range='J20-K20',
-                                  bucket='7x24'
-                                  )
-        assert_series_equal(pd.Series(target['J20-K20 7x24'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
+    with pytest.raises(ValueError):
+        tm.forward_price(mock_spp,
+                         price_method='LMP',
+                         contract_range='F20-I20',
+                         bucket='7x24'
+                         )
 
-        replace.restore()
+    with pytest.raises(ValueError):
+        tm.forward_price(mock_spp,
+                         price_method='LMP',
+                         contract_range='2H20',
+                         bucket='7x24',
+                         real_time=True
+                         )
+
+    market_data(mock_missing_bucket_forward_price)
+    bbid_mock = Mock(return_value='SPP')
+    monkeypatch.setattr('gs_quant.timeseries.measures.Asset.get_identifier', bbid_mock)
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='2Q20',
+                              bucket='7x24'
+                              )
+
+    assert_series_equal(pd.Series(), actual, check_names=False, check_series_type=False)
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='2Q20',
+                              bucket='PEAK'
+                              )
+    _assert_eq(actual, target['peak'])
+
+    actual = tm.forward_price(mock_spp,
+                              price_method='LMP',
+                              contract_range='J20-K20',
+                              bucket='7x24'
+                              )
+    _assert_eq(actual, target['J20-K20 7x24'])
 
 
 def test_get_iso_data():
     tz_map = {'MISO': 'US/Central', 'CAISO': 'US/Pacific'}
     for key in tz_map:
         assert (tm._get_iso_data(key)[0] == tz_map[key])
+    assert tm._get_iso_data('PJM') == ('US/Eastern', 7, 23, (5, 6))
+
+
+def test_contract_months():
+    hours = pd.date_range('2020-12-31 22:00', periods=4, freq='H', tz='US/Central')
+    assert tm._contract_months(hours).tolist() == ['Z20', 'Z20', 'F21', 'F21']
+    months = pd.period_range('1999-11', '2000-02', freq='M')
+    assert tm._contract_months(months).tolist() == ['X99', 'Z99', 'F00', 'G00']
 
 
 def test_string_to_date_interval():
@@ -2210,191 +1878,173 @@ def test_string_to_date_interval():
     assert (tm._string_to_date_interval("March2021")['start_date'] == datetime.date(2021, 3, 1))
     assert (tm._string_to_date_interval("March2021")['end_date'] == datetime.date(2021, 3, 31))
 
-    assert (tm._string_to_date_interval("5Q20") == "Invalid Quarter")
+    assert (tm._string_to_date_interval("G24")['end_date'] == datetime.date(2024, 2, 29))
+    assert (tm._string_to_date_interval("1Q23")['end_date'] == datetime.date(2023, 3, 31))
+    assert (tm._string_to_date_interval("Feb2100")['end_date'] == datetime.date(2100, 2, 28))
+
+    assert (tm._string_to_date_interval("5Q20") is tm._INVALID_QUARTER)
+
+    assert (tm._string_to_date_interval("HH2021") is tm._INVALID_NUM)
 
-    assert (tm._string_to_date_interval("HH2021") == "Invalid num")
+    assert (tm._string_to_date_interval("3H2021") is tm._INVALID_HALF_YEAR)
 
-    assert (tm._string_to_date_interval("3H2021") == "Invalid Half Year")
+    assert (tm._string_to_date_interval("1X20") is tm._INVALID_DATE_CODE)
 
-    assert (tm._string_to_date_interval("Cal2a") == "Invalid year")
-    assert (tm._string_to_date_interval("Marc201") == "Invalid date code")
+    assert (tm._string_to_date_interval("Cal2a") is tm._INVALID_YEAR)
+    assert (tm._string_to_date_interval("Marc201") is tm._INVALID_DATE_CODE)
 
-    assert (tm._string_to_date_interval("M1a2021") == "Invalid date code")
+    assert (tm._string_to_date_interval("M1a2021") is tm._INVALID_DATE_CODE)
 
-    assert (tm._string_to_date_interval("Marcha2021") == "Invalid date code")
+    assert (tm._string_to_date_interval("Marcha2021") is tm._INVALID_DATE_CODE)
 
-    assert (tm._string_to_date_interval("I20") == "Invalid month")
+    assert (tm._string_to_date_interval("I20") is tm._INVALID_MONTH)
 
-    assert (tm._string_to_date_interval("20") == "Unknown date code")
+    assert (tm._string_to_date_interval("20") is tm._UNKNOWN_DATE_CODE)
+    assert tm._UNKNOWN_DATE_CODE == "Unknown date code"
 
+    interval = tm._string_to_date_interval("K20")
+    assert tm._string_to_date_interval("K20") is interval
+    with pytest.raises(TypeError):
+        interval['start_date'] = datetime.date(2020, 1, 1)
 
-def test_implied_volatility():
+
+def test_implied_volatility(market_data, single_day_context):
     target = {
         'F21': [2.880],
         'F21-H21': [2.815756],
     }
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_implied_volatility)
+    market_data(mock_implied_volatility)
     mock = Index('MA001', AssetClass.Commod, 'Option NG Exchange')
 
-    with DataContext(datetime.date(2019, 1, 2), datetime.date(2019, 1, 2)):
-        actual = tm.implied_volatility(mock,
-                                       tenor='F21-H21')
-        assert_series_equal(pd.Series(target['F21-H21'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-    replace.restore()
+    actual = tm.implied_volatility(mock,
+                                   tenor='F21-H21')
+    _assert_eq(actual, target['F21-H21'])
 
 
-def test_fair_price():
+def test_fair_price(market_data, single_day_context):
     target = {
         'F21': [2.880],
         'F21-H21': [2.815756],
     }
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fair_price)
+    market_data(mock_fair_price)
     mock = Index('MA001', AssetClass.Commod, 'Swap NG Exchange')
 
-    with DataContext(datetime.date(2019, 1, 2), datetime.date(2019, 1, 2)):
-        actual = tm.fair_price(mock,
-                               tenor='F21')
-        assert_series_equal(pd.Series(target['F21'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-    replace.restore()
+    actual = tm.fair_price(mock,
+                           tenor='F21')
+    _assert_eq(actual, target['F21'])
 
 
-def test_weighted_average_valuation_curve_for_calendar_strip():
+def test_weighted_average_valuation_curve_for_calendar_strip(market_data, single_day_context):
     target = {
         'F21': [2.880],
         'F21-H21': [2.815756],
     }
-    replace = Replacer()
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_fair_price)
+    market_data(mock_fair_price)
     mock = Index('MA001', AssetClass.Commod, 'Swap NG Exchange')
 
-    with DataContext(datetime.date(2019, 1, 2), datetime.date(2019, 1, 2)):
-        actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
-                                                                         contract_range='F21',
-                                                                         query_type=QueryType.FAIR_PRICE,
-                                                                         measure_field='fairPrice'
-                                                                         )
-        assert_series_equal(pd.Series(target['F21'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
-                                                                         contract_range='F21-H21',
-                                                                         query_type=QueryType.FAIR_PRICE,
-                                                                         measure_field='fairPrice'
-                                                                         )
-        assert_series_equal(pd.Series(target['F21-H21'],
-                                      index=[datetime.date(2019, 1, 2)],
-                                      name='price'),
-                            pd.Series(actual))
-
-        with pytest.raises(ValueError):
-            tm._weighted_average_valuation_curve_for_calendar_strip(mock,
-                                                                    contract_range='Invalid',
-                                                                    query_type=QueryType.FAIR_PRICE,
-                                                                    measure_field='fairPrice'
-                                                                    )
-        with pytest.raises(ValueError):
-            tm._weighted_average_valuation_curve_for_calendar_strip(mock,
-                                                                    contract_range='F20-I20',
-                                                                    query_type=QueryType.FAIR_PRICE,
-                                                                    measure_field='fairPrice'
-                                                                    )
-        with pytest.raises(ValueError):
-            tm._weighted_average_valuation_curve_for_calendar_strip(mock,
-                                                                    contract_range='3H20',
-                                                                    query_type=QueryType.PRICE,
-                                                                    measure_field='fairPrice'
-                                                                    )
-
-    replace.restore()
+    actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                     contract_range='F21',
+                                                                     query_type=QueryType.FAIR_PRICE,
+                                                                     measure_field='fairPrice'
+                                                                     )
+    _assert_eq(actual, target['F21'])
+
+    actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                     contract_range='F21-H21',
+                                                                     query_type=QueryType.FAIR_PRICE,
+                                                                     measure_field='fairPrice'
+                                                                     )
+    _assert_eq(actual, target['F21-H21'])
+
+    partial = _canned_response({
+        'fairPrice': [2.880, 2.844, 2.726, 2.9],
+        'contract': ["F21", "G21", "H21", "F21"]
+    }, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 3 + [datetime.date(2019, 1, 3)]))
+    market_data(_stub(partial))
+    actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                     contract_range='F21-H21',
+                                                                     query_type=QueryType.FAIR_PRICE,
+                                                                     measure_field='fairPrice'
+                                                                     )
+    _assert_eq(actual, target['F21-H21'])
+
+    # several marks for a contract on one date are averaged before weighting (2.800 and 2.888 average to 2.844)
+    duplicated = _canned_response({
+        'fairPrice': [2.880, 2.800, 2.726, 2.888],
+        'contract': ["F21", "G21", "H21", "G21"]
+    }, index=pd.to_datetime([datetime.date(2019, 1, 2)] * 4))
+    market_data(_stub(duplicated))
+    actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                     contract_range='F21-H21',
+                                                                     query_type=QueryType.FAIR_PRICE,
+                                                                     measure_field='fairPrice'
+                                                                     )
+    _assert_eq(actual, target['F21-H21'])
+
+    market_data(_stub(mock_empty_market_data_response()))
+    actual = tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                     contract_range='F21-H21',
+                                                                     query_type=QueryType.FAIR_PRICE,
+                                                                     measure_field='fairPrice'
+                                                                     )
+    assert actual.empty
+    assert actual.name == 'price'
+    assert actual.dataset_ids == ()
 
 
-def test_fundamental_metrics():
-    replace = Replacer()
+@pytest.mark.parametrize('contract_range,query_type', [
+    ('Invalid', QueryType.FAIR_PRICE),
+    ('F20-I20', QueryType.FAIR_PRICE),
+    ('3H20', QueryType.PRICE),
+])
+def test_weighted_average_valuation_curve_for_calendar_strip_invalid(contract_range, query_type):
+    # the contract range is rejected before any data is requested
+    mock = Index('MA001', AssetClass.Commod, 'Swap NG Exchange')
+    with pytest.raises(ValueError):
+        tm._weighted_average_valuation_curve_for_calendar_strip(mock,
+                                                                contract_range=contract_range,
+                                                                query_type=query_type,
+                                                                measure_field='fairPrice'
+                                                                )
+
+
+@pytest.mark.parametrize('measure', [
+    tm.dividend_yield,
+    tm.earnings_per_share,
+    tm.earnings_per_share_positive,
+    tm.net_debt_to_ebitda,
+    tm.price_to_book,
+    tm.price_to_cash,
+    tm.price_to_earnings,
+    tm.price_to_earnings_positive,
+    tm.price_to_sales,
+    tm.return_on_equity,
+    tm.sales_per_share,
+])
+def test_fundamental_metrics(mocker, measure):
     mock_spx = Index('MA890', AssetClass.Equity, 'SPX')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_eq)
+    mocker.patch.object(GsDataApi, 'get_market_data', return_value=_EQ)
     period = '1y'
     direction = tm.FundamentalMetricPeriodDirection.FORWARD
 
-    actual = tm.dividend_yield(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
+    actual = measure(mock_spx, period, direction)
+    assert_series_equal(_EXPECTED_FUNDAMENTAL, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
     with pytest.raises(NotImplementedError):
-        tm.dividend_yield(..., period, direction, real_time=True)
+        measure(..., period, direction, real_time=True)
 
-    actual = tm.earnings_per_share(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.earnings_per_share(..., period, direction, real_time=True)
-
-    actual = tm.earnings_per_share_positive(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.earnings_per_share_positive(..., period, direction, real_time=True)
-
-    actual = tm.net_debt_to_ebitda(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.net_debt_to_ebitda(..., period, direction, real_time=True)
-
-    actual = tm.price_to_book(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.price_to_book(..., period, direction, real_time=True)
-
-    actual = tm.price_to_cash(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.price_to_cash(..., period, direction, real_time=True)
-
-    actual = tm.price_to_earnings(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.price_to_earnings(..., period, direction, real_time=True)
-
-    actual = tm.price_to_earnings_positive(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.price_to_earnings_positive(..., period, direction, real_time=True)
-
-    actual = tm.price_to_sales(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.price_to_sales(..., period, direction, real_time=True)
-
-    actual = tm.return_on_equity(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.return_on_equity(..., period, direction, real_time=True)
-
-    actual = tm.sales_per_share(mock_spx, period, direction)
-    assert_series_equal(pd.Series([5, 1, 2], index=_index * 3, name='fundamentalMetric'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    with pytest.raises(NotImplementedError):
-        tm.sales_per_share(..., period, direction, real_time=True)
 
-    replace.restore()
+# arguments after the asset that central_bank_swap_rate must reject
+_CENTRAL_BANK_SWAP_RATE_INVALID_ARGS = (
+    ('meeting_forward',),
+    (tm.MeetingType.MEETING_FORWARD, 'normalized', '2019-09-01'),
+    (tm.MeetingType.MEETING_FORWARD, 'absolute', 5),
+    (tm.MeetingType.MEETING_FORWARD, 'absolute', '01-09-2019'),
+    (tm.MeetingType.SPOT, 'relative'),
+)
 
 
-def test_central_bank_swap_rate(mocker):
+def test_central_bank_swap_rate(mocker, monkeypatch):
     target = {
         'meeting_absolute': -0.004550907771,
         'meeting_relative': -0.00002833724599999969,
@@ -2405,13 +2055,11 @@ def test_central_bank_swap_rate(mocker):
     mock_eur = Currency('MARFAGXDQRWM07Y2', 'EUR')
 
     with DataContext(dt.date(2019, 12, 6), dt.date(2019, 12, 6)):
-        replace = Replacer()
-        xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-        xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EUR', ))]
+        monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _stub(_RATES_XREF_EUR))
         mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_default_mocker)
 
-        mock_get_data = replace('gs_quant.data.dataset.Dataset.get_data', Mock())
-        mock_get_data.return_value = mock_meeting_absolute()
+        mock_get_data = Mock(return_value=mock_meeting_absolute())
+        monkeypatch.setattr('gs_quant.data.dataset.Dataset.get_data', mock_get_data)
 
         actual_abs = tm.central_bank_swap_rate(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute',
                                                dt.date(2019, 12, 6))
@@ -2428,28 +2076,26 @@ def test_central_bank_swap_rate(mocker):
         assert (target['spot'] == actual_spot.loc[dt.date(2019, 12, 6)])
         assert actual_spot.dataset_ids == ('CENTRAL_BANK_WATCH',)
 
-        with pytest.raises(MqError):
-            tm.central_bank_swap_rate(mock_eur, 'meeting_forward')
-
-        with pytest.raises(MqError):
-            tm.central_bank_swap_rate(mock_eur, tm.MeetingType.MEETING_FORWARD, 'normalized', '2019-09-01')
-
-        with pytest.raises(MqError):
-            tm.central_bank_swap_rate(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute', 5)
-
-        with pytest.raises(MqError):
-            tm.central_bank_swap_rate(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute', '01-09-2019')
-
-        with pytest.raises(MqError):
-            tm.central_bank_swap_rate(mock_eur, tm.MeetingType.SPOT, 'relative')
+        for args in _CENTRAL_BANK_SWAP_RATE_INVALID_ARGS:
+            with pytest.raises(MqError):
+                tm.central_bank_swap_rate(mock_eur, *args)
 
         with pytest.raises(NotImplementedError):
             tm.central_bank_swap_rate(mock_eur, tm.MeetingType.SPOT, 'absolute', real_time=True)
 
-    replace.restore()
+
+# arguments after the asset that policy_rate_expectation must reject
+_POLICY_RATE_EXPECTATION_INVALID_ARGS = (
+    (tm.MeetingType.SPOT,),
+    (tm.MeetingType.MEETING_FORWARD, 'relative', '5'),
+    (tm.MeetingType.MEETING_FORWARD, 'absolute', 5.5),
+    (tm.MeetingType.MEETING_FORWARD, 'absolute', '01-09-2019'),
+    (tm.MeetingType.MEETING_FORWARD, 'normalized', dt.date(2019, 9, 1)),
+    (tm.MeetingType.MEETING_FORWARD, 'relative', -2),
+)
 
 
-def test_policy_rate_expectation(mocker):
+def test_policy_rate_expectation(mocker, monkeypatch):
     target = {
         'meeting_number_absolute': -0.004550907771,
         'meeting_number_relative': -0.000028337246,
@@ -2459,9 +2105,7 @@ def test_policy_rate_expectation(mocker):
     mock_eur = Currency('MARFAGXDQRWM07Y2', 'EUR')
 
     with DataContext(dt.date(2019, 12, 6), dt.date(2019, 12, 6)):
-        replace = Replacer()
-        xrefs = replace('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', Mock())
-        xrefs.return_value = [GsTemporalXRef(dt.date(2019, 1, 1), dt.date(2952, 12, 31), XRef(bbid='EUR', ))]
+        monkeypatch.setattr('gs_quant.timeseries.measures.GsAssetApi.get_asset_xrefs', _stub(_RATES_XREF_EUR))
         mocker.patch.object(GsAssetApi, 'map_identifiers', side_effect=map_identifiers_default_mocker)
         mocker.patch.object(Dataset, 'get_data', side_effect=get_data_policy_rate_expectation_mocker)
 
@@ -2492,36 +2136,19 @@ def test_policy_rate_expectation(mocker):
         with pytest.raises(MqError):
             tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'relative', 2)
 
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.SPOT)
-
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'relative', '5')
-
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute', 5.5)
-
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute', '01-09-2019')
-
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'normalized', dt.date(2019, 9, 1))
-
-        with pytest.raises(MqError):
-            tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'relative', -2)
+        for args in _POLICY_RATE_EXPECTATION_INVALID_ARGS:
+            with pytest.raises(MqError):
+                tm.policy_rate_expectation(mock_eur, *args)
 
         with pytest.raises(NotImplementedError):
             tm.policy_rate_expectation(mock_eur, tm.MeetingType.SPOT, 'absolute', real_time=True)
 
-        mock_get_data = replace('gs_quant.data.dataset.Dataset.get_data', Mock())
-        mock_get_data.return_value = pd.DataFrame()
+        monkeypatch.setattr('gs_quant.data.dataset.Dataset.get_data', _stub(pd.DataFrame()))
         with pytest.raises(MqError):
             tm.policy_rate_expectation(mock_eur, tm.MeetingType.MEETING_FORWARD, 'absolute', 2)
 
-    replace.restore()
-
 
-def test_realized_volatility():
+def test_realized_volatility(monkeypatch):
     from gs_quant.timeseries.econometrics import volatility, Returns
     from gs_quant.timeseries.statistics import generate_series
 
@@ -2529,95 +2156,55 @@ def test_realized_volatility():
     window = 10
     type_ = Returns.SIMPLE
 
-    replace = Replacer()
-    market_data = replace('gs_quant.timeseries.measures._market_data_timed', Mock())
-    return_value = MarketDataResponseFrame(random)
-    return_value.dataset_ids = _test_datasets
+    market_data = Mock()
+    monkeypatch.setattr('gs_quant.timeseries.measures._market_data_timed', market_data)
+    return_value = MarketDataResponseFrame(random, dataset_ids=_test_datasets)
     market_data.return_value = return_value
 
     expected = volatility(random, window, type_)
     actual = tm.realized_volatility(Cross('MA123', 'ABCXYZ'), window, type_)
-    assert_series_equal(expected, pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-    replace.restore()
-
-
-def test_esg_aggregate():
-    replace = Replacer()
-
+    assert_series_equal(expected, actual, check_series_type=False)
+    assert actual.dataset_ids == _test_datasets
+
+
+@pytest.mark.parametrize('metric,value_unit,expected', [
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('esNumericScore')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_POLICY, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('esPolicyScore')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_AGGREGATE, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('esScore')),
+    (tm.EsgMetric.GOVERNANCE_AGGREGATE, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('gScore')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_MOMENTUM, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('esMomentumScore')),
+    (tm.EsgMetric.GOVERNANCE_REGIONAL, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_SCORE.rename('gRegionalScore')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC, tm.EsgValueUnit.PERCENTILE,
+     _EXPECTED_ESG_PERCENTILE.rename('esNumericPercentile')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_POLICY, tm.EsgValueUnit.PERCENTILE,
+     _EXPECTED_ESG_PERCENTILE.rename('esPolicyPercentile')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_AGGREGATE, tm.EsgValueUnit.PERCENTILE,
+     _EXPECTED_ESG_PERCENTILE.rename('esPercentile')),
+    (tm.EsgMetric.GOVERNANCE_AGGREGATE, tm.EsgValueUnit.PERCENTILE, _EXPECTED_ESG_PERCENTILE.rename('gPercentile')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_MOMENTUM, tm.EsgValueUnit.PERCENTILE,
+     _EXPECTED_ESG_PERCENTILE.rename('esMomentumPercentile')),
+    (tm.EsgMetric.GOVERNANCE_REGIONAL, tm.EsgValueUnit.PERCENTILE,
+     _EXPECTED_ESG_PERCENTILE.rename('gRegionalPercentile')),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, tm.EsgValueUnit.SCORE, _EXPECTED_ESG_DISCLOSURE),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, tm.EsgValueUnit.PERCENTILE, _EXPECTED_ESG_DISCLOSURE),
+    (tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, None, _EXPECTED_ESG_DISCLOSURE),
+])
+def test_esg_aggregate(market_data, metric, value_unit, expected):
     mock_aapl = Stock('MA4B66MW5E27U9VBB94', 'AAPL')
-    replace('gs_quant.timeseries.measures.GsDataApi.get_market_data', mock_esg)
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='esNumericScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_POLICY, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='esPolicyScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_AGGREGATE, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='esScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.GOVERNANCE_AGGREGATE, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='gScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_MOMENTUM, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='esMomentumScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.GOVERNANCE_REGIONAL, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([2, 4, 6], index=_index * 3, name='gRegionalScore'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='esNumericPercentile'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_POLICY, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='esPolicyPercentile'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_AGGREGATE, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='esPercentile'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.GOVERNANCE_AGGREGATE, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='gPercentile'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_MOMENTUM, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='esMomentumPercentile'), pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.GOVERNANCE_REGIONAL, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([81.2, 75.4, 65.7], index=_index * 3, name='gRegionalPercentile'), pd.Series(actual))
+    market_data(_stub(_ESG))
+    actual = tm.esg_aggregate(mock_aapl, metric, value_unit)
+    assert_series_equal(expected, actual, check_series_type=False)
     assert actual.dataset_ids == _test_datasets
 
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, tm.EsgValueUnit.SCORE)
-    assert_series_equal(pd.Series([49.2, 55.7, 98.4], index=_index * 3, name='esDisclosurePercentage'),
-                        pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, tm.EsgValueUnit.PERCENTILE)
-    assert_series_equal(pd.Series([49.2, 55.7, 98.4], index=_index * 3, name='esDisclosurePercentage'),
-                        pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
-
-    actual = tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE)
-    assert_series_equal(pd.Series([49.2, 55.7, 98.4], index=_index * 3, name='esDisclosurePercentage'),
-                        pd.Series(actual))
-    assert actual.dataset_ids == _test_datasets
 
+def test_esg_aggregate_invalid():
+    mock_aapl = Stock('MA4B66MW5E27U9VBB94', 'AAPL')
     with pytest.raises(MqValueError):
         tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC)
 
     with pytest.raises(NotImplementedError):
         tm.esg_aggregate(mock_aapl, tm.EsgMetric.ENVIRONMENTAL_SOCIAL_NUMERIC, tm.EsgValueUnit.SCORE, real_time=True)
 
-    replace.restore()
-
 
 if __name__ == '__main__':
     pytest.main(args=["test_measures.py"])
@@ -360,17 +360,12 @@ def change(x: pd.Series) -> pd.Series:
 
 
 def _get_annualization_factor(x):
-    prev_idx = x.index[0]
-    distances = []
+    # whole days between consecutive observations, floored like timedelta.days
+    distances = np.diff(pd.DatetimeIndex(x.index).to_numpy(dtype='datetime64[ns]')) // np.timedelta64(1, 'D')
+    if (distances == 0).any():
+        raise MqValueError('multiple data points on same date')
 
-    for idx, value in x.iloc[1:].iteritems():
-        d = (idx - prev_idx).days
-        if d == 0:
-            raise MqValueError('multiple data points on same date')
-        distances.append(d)
-        prev_idx = idx
-
-    average_distance = numpy.average(distances)
+    average_distance = np.average(distances)
     if average_distance < 2.1:
         factor = AnnualizationFactor.DAILY
     elif 6 <= average_distance < 8:
@@ -15,9 +15,10 @@ under the License.
 """
 import inspect
 import logging
+import re
 from collections import namedtuple
 from enum import Enum, IntEnum
-from functools import wraps
+from functools import lru_cache, wraps
 from typing import Optional, Union, List
 
 import pandas as pd
@@ -33,25 +34,17 @@ def _create_int_enum(name, mappings):
     return IntEnum(name, {k.upper(): v for k, v in mappings.items()})
 
 
+_TENOR_RE = re.compile('(\\d+)([dwmy])')
+_TENOR_UNITS = {'d': 'days', 'w': 'weeks', 'm': 'months', 'y': 'years'}
+
+
+@lru_cache(maxsize=256)
 def _to_offset(tenor: str) -> pd.DateOffset:
-    import re
-    matcher = re.fullmatch('(\\d+)([dwmy])', tenor)
+    matcher = _TENOR_RE.fullmatch(tenor)
     if not matcher:
         raise ValueError('invalid tenor ' + tenor)
 
-    ab = matcher.group(2)
-    if ab == 'd':
-        name = 'days'
-    elif ab == 'w':
-        name = 'weeks'
-    elif ab == 'm':
-        name = 'months'
-    else:
-        assert ab == 'y'
-        name = 'years'
-
-    kwarg = {name: int(matcher.group(1))}
-    return pd.DateOffset(**kwarg)
+    return pd.DateOffset(**{_TENOR_UNITS[matcher.group(2)]: int(matcher.group(1))})
 
 
 Interpolate = _create_enum('Interpolate', ['intersect', 'step', 'nan', 'zero', 'time'])
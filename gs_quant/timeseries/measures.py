@@ -16,17 +16,20 @@ import calendar
 import datetime
 import logging
 import re
+import sys
+import threading
 import time
 from collections import namedtuple
 from enum import auto
+from functools import lru_cache
 from numbers import Real
+from types import MappingProxyType
 
-import cachetools.func
+import cachetools
 import inflection
 import numpy as np
 import pandas as pd
 from dateutil import tz
-from dateutil.relativedelta import relativedelta
 from pandas import Series
 from pandas.tseries.holiday import Holiday, AbstractHolidayCalendar, USMemorialDay, USLaborDay, USThanksgivingDay, \
     sunday_to_monday
@@ -184,6 +187,13 @@ ESG_METRIC_TO_QUERY_TYPE = {
     "esDisclosurePercentage": QueryType.ES_DISCLOSURE_PERCENTAGE
 }
 
+# (metric, value unit) -> dataset field; the disclosure percentage is the same field whatever the unit
+_ESG_FIELDS = {(metric, unit): inflection.camelize(metric.value, False) + unit.value.capitalize()
+               for metric in EsgMetric for unit in EsgValueUnit
+               if metric != EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE}
+_ESG_FIELDS.update({(EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE, unit): 'esDisclosurePercentage'
+                    for unit in (*EsgValueUnit, None)})
+
 CURRENCY_TO_OIS_RATE_BENCHMARK = {
     'AUD': 'AUD OIS',
     'USD': 'USD OIS',
@@ -225,6 +235,17 @@ def _asset_from_spec(asset_spec: ASSET_SPEC) -> Asset:
                                                                                      AssetIdentifier.MARQUEE_ID)
 
 
+def _fx_vol_inverted_cross(bbid: str) -> Optional[str]:
+    # bbid of the cross that FX vol is stored under, or None if it is stored under bbid itself
+    legit_usd_cross = str.startswith(bbid, "USD") and not str.endswith(bbid, ("EUR", "GBP", "NZD", "AUD"))
+    legit_eur_cross = str.startswith(bbid, "EUR")
+    legit_jpy_cross = str.endswith(bbid, "JPY") and not str.startswith(bbid, ("KRW", "IDR", "CLP", "COP"))
+    odd_cross = bbid in ("EURUSD", "GBPUSD", "NZDUSD", "AUDUSD", "JPYKRW", "JPYIDR", "JPYCLP", "JPYCOP")
+    if not legit_usd_cross and not legit_eur_cross and not legit_jpy_cross and not odd_cross:
+        return bbid[3:] + bbid[:3]
+    return None
+
+
 def cross_stored_direction_for_fx_vol(asset_spec: ASSET_SPEC) -> str:
     asset = _asset_from_spec(asset_spec)
     asset_id = asset.get_marquee_id()
@@ -233,12 +254,8 @@ def cross_stored_direction_for_fx_vol(asset_spec: ASSET_SPEC) -> str:
         if asset.asset_class is AssetClass.FX:
             bbid = asset.get_identifier(AssetIdentifier.BLOOMBERG_ID)
             if bbid is not None:
-                legit_usd_cross = str.startswith(bbid, "USD") and not str.endswith(bbid, ("EUR", "GBP", "NZD", "AUD"))
-                legit_eur_cross = str.startswith(bbid, "EUR")
-                legit_jpy_cross = str.endswith(bbid, "JPY") and not str.startswith(bbid, ("KRW", "IDR", "CLP", "COP"))
-                odd_cross = bbid in ("EURUSD", "GBPUSD", "NZDUSD", "AUDUSD", "JPYKRW", "JPYIDR", "JPYCLP", "JPYCOP")
-                if not legit_usd_cross and not legit_eur_cross and not legit_jpy_cross and not odd_cross:
-                    cross = bbid[3:] + bbid[:3]
+                cross = _fx_vol_inverted_cross(bbid)
+                if cross is not None:
                     cross_asset = SecurityMaster.get_asset(cross, AssetIdentifier.BLOOMBERG_ID)
                     result_id = cross_asset.get_marquee_id()
     except TypeError:
@@ -329,9 +346,12 @@ def _get_custom_bd(exchange):
 def parse_meeting_date(meeting_str: str = '2019-01-01'):
     if not isinstance(meeting_str, str):
         return ''
-    elif meeting_str == '':
-        return ''
+    return _parse_meeting_date(meeting_str)
+
 
+@lru_cache(maxsize=256)
+def _parse_meeting_date(meeting_str: str):
+    # dashboards re-request the same few meeting and valuation dates, so parse each string once
     try:
         year, month, day = meeting_str.split('-')
         return dt.date(int(year), int(month), int(day))
@@ -1244,7 +1264,13 @@ def fwd_term(asset: Asset, pricing_date: Optional[GENERIC_DATE] = None, *, sourc
     return series
 
 
-@cachetools.func.ttl_cache()  # fine as long as availability is not different between users
+_VAR_SWAP_TENORS_CACHE = cachetools.TTLCache(1024, 3600)
+
+
+# keyed on asset id so separately loaded instances of one asset share an entry; fine as long as availability is not
+# different between users
+@cachetools.cached(_VAR_SWAP_TENORS_CACHE, lambda asset: cachetools.keys.hashkey(asset.get_marquee_id()),
+                   threading.RLock())
 def _var_swap_tenors(asset: Asset):
     from gs_quant.session import GsSession
 
@@ -1303,7 +1329,8 @@ def var_term(asset: Asset, pricing_date: Optional[str] = None, forward_start_dat
                 if not c.empty:
                     c['tenor'] = t1
                     sub_frames.append(c)
-            df = pd.concat(sub_frames)
+            # no usable forward tenors means nothing was fetched, and pd.concat rejects an empty list
+            df = pd.concat(sub_frames) if sub_frames else pd.DataFrame()
             dataset_ids = tuple(dataset_ids)
         else:
             q = GsDataApi.build_market_data_query([asset.get_marquee_id()], QueryType.VAR_SWAP,
@@ -1380,126 +1407,162 @@ def var_swap(asset: Asset, tenor: str, forward_start_date: Optional[str] = None,
         if df.empty:
             series = ExtendedSeries()
         else:
-            grouped = df.groupby(Fields.TENOR.value)
-            try:
-                yg = grouped.get_group(yt)[Fields.VAR_SWAP.value]
-                zg = grouped.get_group(zt)[Fields.VAR_SWAP.value]
-            except KeyError:
+            tenor_col = df[Fields.TENOR.value]
+            yg = df.loc[tenor_col == yt, Fields.VAR_SWAP.value]
+            zg = df.loc[tenor_col == zt, Fields.VAR_SWAP.value]
+            if yg.empty or zg.empty:
                 _logger.debug('no data for one or more tenors')
                 series = ExtendedSeries()
                 series.dataset_ids = ()
                 return series
-            series = ExtendedSeries((z * zg - y * yg) / x)
+            if yg.index.equals(zg.index):
+                # both tenors are usually quoted on the same dates, so skip index alignment
+                values = (z * zg.to_numpy() - y * yg.to_numpy()) / x
+                series = ExtendedSeries(values, index=zg.index, name=Fields.VAR_SWAP.value)
+            else:
+                series = ExtendedSeries((z * zg - y * yg) / x)
         series.dataset_ids = dataset_ids
         return series
 
 
-def _get_iso_data(region: str):
-    timezone = 'US/Eastern'
-    peak_start = 7
-    peak_end = 23
-    weekends = [5, 6]
+# ISO -> (timezone, peak start hour, peak end hour, weekend days); other ISOs use _DEFAULT_ISO_DATA
+_DEFAULT_ISO_DATA = ('US/Eastern', 7, 23, (5, 6))
+_ISO_DATA = MappingProxyType({
+    'MISO': ('US/Central', 6, 22, (5, 6)),
+    'ERCOT': ('US/Central', 6, 22, (5, 6)),
+    'SPP': ('US/Central', 6, 22, (5, 6)),
+    'CAISO': ('US/Pacific', 7, 23, (6,)),
+})
 
-    if region in ['MISO', 'ERCOT', 'SPP']:
-        timezone = 'US/Central'
-        peak_start = 6
-        peak_end = 22
-    if region == 'CAISO':
-        timezone = 'US/Pacific'
-        weekends = [6]
 
-    return timezone, peak_start, peak_end, weekends
+def _get_iso_data(region: str):
+    return _ISO_DATA.get(region, _DEFAULT_ISO_DATA)
 
 
 def _filter_by_bucket(df, bucket, holidays, region):
     # TODO: get frequency definition from SecDB
     timezone, peak_start, peak_end, weekends = _get_iso_data(region)
-    if bucket.lower() == '7x24':
-        pass
+    bucket_type = bucket.lower()
+    if bucket_type == '7x24':
+        return df
+
+    # masks are built once over the hour/day columns and combined per bucket
+    hour = df['hour'].to_numpy()
+    off_peak_hours = (hour < peak_start) | (hour >= peak_end)
+    # 7x8: 11pm to 7am
+    if bucket_type == '7x8':
+        return df.loc[off_peak_hours]
+
+    non_working_days = df['date'].isin(holidays).to_numpy() | np.isin(df['day'].to_numpy(), weekends)
     # offpeak: 11pm-7am & weekend & holiday
-    elif bucket.lower() == 'offpeak':
-        df = df.loc[df['date'].isin(holidays) |
-                    df['day'].isin(weekends) |
-                    (~df['date'].isin(holidays) & ~df['day'].isin(weekends) &
-                     ((df['hour'] < peak_start) | (df['hour'] > peak_end - 1)))]
+    if bucket_type == 'offpeak':
+        mask = non_working_days | off_peak_hours
     # peak: 7am to 11pm on weekdays
-    elif bucket.lower() == 'peak':
-        df = df.loc[(~df['date'].isin(holidays)) & (~df['day'].isin(weekends)) & (df['hour'] > peak_start - 1) &
-                    (df['hour'] < peak_end)]
-    # 7x8: 11pm to 7am
-    elif bucket.lower() == '7x8':
-        df = df.loc[(df['hour'] < peak_start) | (df['hour'] > peak_end - 1)]
+    elif bucket_type == 'peak':
+        mask = ~non_working_days & ~off_peak_hours
     # 2x16h: weekends & holidays
-    elif bucket.lower() == '2x16h' or bucket.lower() == 'suh1x16':
-        df = df.loc[((df['date'].isin(holidays)) | df['day'].isin(weekends)) & ((df['hour'] > peak_start - 1) &
-                                                                                (df['hour'] < peak_end))]
+    elif bucket_type == '2x16h' or bucket_type == 'suh1x16':
+        mask = non_working_days & ~off_peak_hours
     else:
         raise ValueError('Invalid bucket: ' + bucket + '. Expected Value: peak, offpeak, 7x24, 7x8, 2x16h.')
-    return df
+    return df.loc[mask]
+
+
+# date interval parse errors, interned so callers and tests can compare by identity
+_INVALID_YEAR = sys.intern("Invalid year")
+_INVALID_MONTH = sys.intern("Invalid month")
+_INVALID_NUM = sys.intern("Invalid num")
+_INVALID_QUARTER = sys.intern("Invalid Quarter")
+_INVALID_HALF_YEAR = sys.intern("Invalid Half Year")
+_INVALID_DATE_CODE = sys.intern("Invalid date code")
+_UNKNOWN_DATE_CODE = sys.intern("Unknown date code")
+
+
+def _days_in_month(year: int, month: int) -> int:
+    if 1901 <= year <= 2099:
+        return _DAYS_IN_MONTH_48[(year % 4) * 12 + month - 1]
+    return calendar.monthrange(year, month)[1]
+
+
+def _month_interval(year: int, first_month: int, last_month: int) -> MappingProxyType:
+    return MappingProxyType({'start_date': datetime.date(year, first_month, 1),
+                             'end_date': datetime.date(year, last_month, _days_in_month(year, last_month))})
+
+
+def _contract_month_interval(prefix: str, year: int):
+    month = _CONTRACT_MONTH_INDEX.get(prefix.upper())
+    return _INVALID_MONTH if month is None else _month_interval(year, month, month)
+
+
+def _period_interval(prefix: str, year: int):
+    if prefix.isdigit():
+        return _month_interval(year, 1, 12)
+    if not prefix[0].isdigit():
+        return _INVALID_NUM
+    period = _PERIOD_MONTHS.get(prefix[1].upper())
+    if period is None:
+        return _INVALID_DATE_CODE
+    length, count, error = period
+    num = int(prefix[0])
+    if not 1 <= num <= count:
+        return error
+    return _month_interval(year, length * (num - 1) + 1, length * num)
+
+
+def _named_interval(prefix: str, year: int):
+    if prefix.casefold() == 'cal':
+        return _month_interval(year, 1, 12)
+    month = _MONTH_NAME_INDEX.get(prefix)
+    return _INVALID_DATE_CODE if month is None else _month_interval(year, month, month)
+
+
+# days in each month over a four year leap cycle, indexed by (year % 4) * 12 + month - 1; exact for 1901-2099
+_DAYS_IN_MONTH_48 = tuple(calendar.monthrange(2000 + year, month)[1] for year in range(4) for month in range(1, 13))
+_CONTRACT_MONTH_INDEX = {code: index for index, code in enumerate(_CONTRACT_MONTH_CODES, 1)}
+_MONTH_NAME_INDEX = {**{name: index for index, name in enumerate(calendar.month_abbr) if name},
+                     **{name: index for index, name in enumerate(calendar.month_name) if name}}
+# period code -> (months per period, periods per year, error for an out of range period number)
+_PERIOD_MONTHS = {'Q': (3, 4, _INVALID_QUARTER), 'H': (6, 2, _INVALID_HALF_YEAR)}
+# length of the code preceding the year -> parser; longer codes are month names or Cal
+_DATE_INTERVAL_PARSERS = {
+    0: lambda prefix, year: _UNKNOWN_DATE_CODE,
+    1: _contract_month_interval,
+    2: _period_interval,
+}
 
 
+@lru_cache(maxsize=4096)
 def _string_to_date_interval(interval: str):
     """
     Slang Date::Interval implementation
     Accept months (e.g. F07), quarters (e.g. 4Q06), half-years (e.g. 1H07), and years (e.g. Cal07 or 2007)
     :param interval: date-interval
-    :return: start and end date
+    :return: read-only mapping of start and end date, or an error message
     """
-    if interval[-2:].isdigit():
-        YS = interval[-2:]
-        year = int("20" + YS) if int(YS) <= 51 else int("19" + YS)
-    else:
-        return "Invalid year"
-
+    if not interval[-2:].isdigit():
+        return _INVALID_YEAR
     if len(interval) > 4 and interval[-4:].isdigit():
-        YS = interval[-4:]
-        year = int(YS)
-
-    start_year = datetime.date(year, 1, 1)
-    if len(interval) == 1 + len(YS):
-        if interval[0].upper() in _CONTRACT_MONTH_CODES:
-            month_index = _CONTRACT_MONTH_CODES.index(interval[0].upper()) + 1
-            start_date = datetime.date(year, month_index, 1)
-            end_date = datetime.date(year, month_index, calendar.monthrange(year, month_index)[1])
-        else:
-            return "Invalid month"
-    elif (len(interval) == 2 + len(YS) and interval.isdigit()) or (
-            interval.casefold().startswith("Cal".casefold()) and len(interval) == 3 + len(YS)):
-        start_date = datetime.date(year, 1, 1)
-        end_date = datetime.date(year, 12, 31)
-    elif len(interval) == 2 + len(YS):
-        if interval[0].isdigit():
-            num = int(interval[0])
-        else:
-            return "Invalid num"
-        if interval[1].upper() == "Q":
-            if 1 <= num <= 4:
-                start_date = (start_year + relativedelta(months=+(3 * (num - 1))))
-                end_date = start_year + relativedelta(months=+(3 * num), days=-1)
-            else:
-                return "Invalid Quarter"
-        if interval[1].upper() == "H":
-            if 1 <= num <= 2:
-                start_date = start_year + relativedelta(months=+(6 * (num - 1)))
-                end_date = start_year + relativedelta(months=+(6 * num), days=-1)
-            else:
-                return "Invalid Half Year"
-    elif len(interval) >= 3 + len(YS):
-        left = interval[0:len(interval) - len(YS)]
-        if left.isalpha():
-            if left in calendar.month_name:
-                month_index = {v: k for k, v in enumerate(calendar.month_name)}[left]
-            elif left in calendar.month_abbr:
-                month_index = {v: k for k, v in enumerate(calendar.month_abbr)}[left]
-            else:
-                return "Invalid date code"
-            start_date = datetime.date(year, month_index, 1)
-            end_date = datetime.date(year, month_index, calendar.monthrange(year, month_index)[1])
-        else:
-            return "Invalid date code"
+        prefix, year = interval[:-4], int(interval[-4:])
     else:
-        return "Unknown date code"
-    return {'start_date': start_date, 'end_date': end_date}
+        prefix, year = interval[:-2], int(interval[-2:])
+        year += 2000 if year <= 51 else 1900
+
+    parser = _DATE_INTERVAL_PARSERS.get(len(prefix), _named_interval)
+    return parser(prefix, year)
+
+
+def _contract_months(index) -> np.ndarray:
+    """
+    Contract code (e.g. F21) of the month each point of a datetime or period index falls in
+    :param index: DatetimeIndex or PeriodIndex
+    :return: array of contract codes aligned with the index
+    """
+    # month ordinals (year * 12 + month - 1); only the distinct months are formatted
+    ordinals = index.year.to_numpy() * 12 + index.month.to_numpy() - 1
+    months, inverse = np.unique(ordinals, return_inverse=True)
+    codes = np.array([_CONTRACT_MONTH_CODES[month % 12] + '{:02d}'.format(month // 12 % 100) for month in months],
+                     dtype=object)
+    return codes[inverse]
 
 
 def _merge_curves_by_weighted_average(forwards_data, weights, keys, measure_column):
@@ -1553,22 +1616,14 @@ def _weighted_average_valuation_curve_for_calendar_strip(asset, contract_range,
     else:
         end_contract_range = start_date_interval['end_date']
 
-    dates_contract_range = pd.date_range(start=start_contract_range,
-                                         end=end_contract_range,
-                                         ).to_frame()
-    dates_contract_range['date'] = dates_contract_range.index.date
-    dates_contract_range['month'] = dates_contract_range.index.month - 1
-    dates_contract_range['year'] = dates_contract_range.index.year
-    dates_contract_range['contract_month'] = dates_contract_range.apply(
-        lambda row: _CONTRACT_MONTH_CODES[row['month']] + str(row['year'])[-2:], axis=1)
-
-    weights = dates_contract_range.groupby('contract_month').size()
-    weights = pd.DataFrame({'contract': weights.index, 'weight': weights.values})
+    # every interval spans whole months, so each contract is weighted by the number of days in its month
+    months = pd.period_range(start=start_contract_range, end=end_contract_range, freq='M')
+    contracts = _contract_months(months).tolist()
+    weights = months.days_in_month.to_numpy(dtype=np.float64)
 
     start, end = DataContext.current.start_date, DataContext.current.end_date
 
-    contracts_to_query = weights['contract'].unique().tolist()
-    where = dict(contract=contracts_to_query)
+    where = dict(contract=contracts)
 
     with DataContext(start, end):
         q = GsDataApi.build_market_data_query([asset.get_marquee_id()], query_type,
@@ -1577,12 +1632,16 @@ def _weighted_average_valuation_curve_for_calendar_strip(asset, contract_range,
                                               real_time=False)
         data = _market_data_timed(q)
         dataset_ids = getattr(data, 'dataset_ids', ())
+        _logger.debug('q %s', q)
 
-        data['dates'] = data.index.date
-        print('q %s', q)
-
-    keys = ['contract', 'dates']
-    result = _merge_curves_by_weighted_average(data, weights, keys, measure_field)
+    if data.empty:
+        result = ExtendedSeries(dtype=float, name='price')
+    else:
+        # one row per date and one column per contract; dates missing any contract are dropped. Several marks for
+        # the same contract on a date are averaged into one price, so they do not add to that contract's weight
+        prices = pd.pivot_table(data, values=measure_field, index=data.index.date, columns='contract', aggfunc='mean')
+        prices = prices.reindex(columns=contracts).dropna()
+        result = ExtendedSeries(prices.to_numpy() @ weights / weights.sum(), index=prices.index, name='price')
     result.dataset_ids = dataset_ids
     return result
 
@@ -1655,10 +1714,7 @@ def forward_price(asset: Asset, price_method: str = 'LMP', bucket: str = 'PEAK',
     dates_contract_range['date'] = dates_contract_range.index.date
     dates_contract_range['hour'] = dates_contract_range.index.hour
     dates_contract_range['day'] = dates_contract_range.index.dayofweek
-    dates_contract_range['month'] = dates_contract_range.index.month - 1
-    dates_contract_range['year'] = dates_contract_range.index.year
-    dates_contract_range['contract_month'] = dates_contract_range.apply(
-        lambda row: _CONTRACT_MONTH_CODES[row['month']] + str(row['year'])[-2:], axis=1)
+    dates_contract_range['contract_month'] = _contract_months(dates_contract_range.index)
     holidays = NercCalendar().holidays(start=start_contract_range, end=end_contract_range).date
 
     weights = []
@@ -1753,7 +1809,7 @@ def bucketize_price(asset: Asset, price_method: str, bucket: str = '7x24',
     # This will remove any duplicate prices uploaded with the same timestamp
     df = df.drop_duplicates()
     # freq is the frequency at which the ISO publishes data for e.g. 15 min, 1hr
-    freq = int(min(np.diff(df.index).astype('timedelta64[s]') / np.timedelta64(1, 's')))
+    freq = int(np.diff(df.index.to_numpy(dtype='datetime64[ns]')).min() / np.timedelta64(1, 's'))
     # checking missing data points
     ref_hour_range = pd.date_range(str(start_date), str(end_date + datetime.timedelta(days=1)),
                                    freq=str(freq) + "S", tz=timezone, closed='left')
@@ -1878,13 +1934,11 @@ def policy_rate_expectation(asset: Asset, rate_type: MeetingType = MeetingType.M
 
         cbw_df = ds.get_data(assetId=[mqid], rateType=rate_type, meetingNumber=meeting_number,
                              start=CENTRAL_BANK_WATCH_START_DATE)
-    elif isinstance(meeting_date, str):
-        meeting_date = parse_meeting_date(meeting_date)
-        if meeting_date == '':
-            raise MqValueError('Meeting date string must be of the format: YYYY-MM-DD')
-        cbw_df = ds.get_data(assetId=[mqid], rateType=rate_type, meeting_date=meeting_date,
-                             start=CENTRAL_BANK_WATCH_START_DATE)
     else:
+        if isinstance(meeting_date, str):
+            meeting_date = parse_meeting_date(meeting_date)
+            if meeting_date == '':
+                raise MqValueError('Meeting date string must be of the format: YYYY-MM-DD')
         cbw_df = ds.get_data(assetId=[mqid], rateType=rate_type, meeting_date=meeting_date,
                              start=CENTRAL_BANK_WATCH_START_DATE)
 
@@ -1907,6 +1961,29 @@ def policy_rate_expectation(asset: Asset, rate_type: MeetingType = MeetingType.M
     return series
 
 
+def _fundamental_metric(asset: Asset, metric: str, period: str, period_direction: FundamentalMetricPeriodDirection,
+                        measure: str, *, source: str = None, real_time: bool = False) -> Series:
+    if real_time:
+        raise NotImplementedError('real-time {} not implemented'.format(measure))
+
+    mqid = asset.get_marquee_id()
+
+    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
+
+    q = GsDataApi.build_market_data_query(
+        [mqid],
+        QueryType.FUNDAMENTAL_METRIC,
+        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
+        source=source,
+        real_time=real_time
+    )
+
+    q['queries'][0]['vendor'] = 'Goldman Sachs'
+    _logger.debug('q %s', q)
+    df = _market_data_timed(q)
+    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+
+
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
 def dividend_yield(asset: Asset, period: str, period_direction: FundamentalMetricPeriodDirection,
                    *, source: str = None, real_time: bool = False) -> Series:
@@ -1926,26 +2003,8 @@ def dividend_yield(asset: Asset, period: str, period_direction: FundamentalMetri
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: dividend yield
     """
-    if real_time:
-        raise NotImplementedError('real-time dividend_yield not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Dividend Yield"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Dividend Yield", period, period_direction,
+                               'dividend_yield', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -1969,26 +2028,8 @@ def earnings_per_share(asset: Asset,
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: earnings per share
     """
-    if real_time:
-        raise NotImplementedError('real-time earnings_per_share not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Earnings per Share"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Earnings per Share", period, period_direction,
+                               'earnings_per_share', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2012,26 +2053,8 @@ def earnings_per_share_positive(asset: Asset,
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: earnings per share positive
     """
-    if real_time:
-        raise NotImplementedError('real-time earnings_per_share_positive not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Earnings per Share Positive"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Earnings per Share Positive", period, period_direction,
+                               'earnings_per_share_positive', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2055,26 +2078,8 @@ def net_debt_to_ebitda(asset: Asset,
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Net Debt to EBITDA
     """
-    if real_time:
-        raise NotImplementedError('real-time net_debt_to_ebitda not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Net Debt to EBITDA"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Net Debt to EBITDA", period, period_direction,
+                               'net_debt_to_ebitda', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2096,26 +2101,8 @@ def price_to_book(asset: Asset, period: str, period_direction: FundamentalMetric
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Price to Book
     """
-    if real_time:
-        raise NotImplementedError('real-time price_to_book not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Price to Book"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Price to Book", period, period_direction,
+                               'price_to_book', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2137,26 +2124,8 @@ def price_to_cash(asset: Asset, period: str, period_direction: FundamentalMetric
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Price to Cash
     """
-    if real_time:
-        raise NotImplementedError('real-time price_to_cash not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Price to Cash"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Price to Cash", period, period_direction,
+                               'price_to_cash', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2178,26 +2147,8 @@ def price_to_earnings(asset: Asset, period: str, period_direction: FundamentalMe
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Price to Earnings
     """
-    if real_time:
-        raise NotImplementedError('real-time price_to_earnings not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Price to Earnings"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Price to Earnings", period, period_direction,
+                               'price_to_earnings', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2221,26 +2172,8 @@ def price_to_earnings_positive(asset: Asset,
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Price to Earnings Positive
     """
-    if real_time:
-        raise NotImplementedError('real-time price_to_earnings_positive not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Price to Earnings Positive"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Price to Earnings Positive", period, period_direction,
+                               'price_to_earnings_positive', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2262,26 +2195,8 @@ def price_to_sales(asset: Asset, period: str, period_direction: FundamentalMetri
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Price to Sales
     """
-    if real_time:
-        raise NotImplementedError('real-time price_to_sales not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Price to Sales"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Price to Sales", period, period_direction,
+                               'price_to_sales', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2303,26 +2218,8 @@ def return_on_equity(asset: Asset, period: str, period_direction: FundamentalMet
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Return on Equity
     """
-    if real_time:
-        raise NotImplementedError('real-time return_on_equity not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Return on Equity"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Return on Equity", period, period_direction,
+                               'return_on_equity', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Equity,), None, [QueryType.FUNDAMENTAL_METRIC])
@@ -2344,26 +2241,8 @@ def sales_per_share(asset: Asset, period: str, period_direction: FundamentalMetr
     :param real_time: whether to retrieve intraday data instead of EOD
     :return: Sales per Share
     """
-    if real_time:
-        raise NotImplementedError('real-time sales_per_share not implemented')
-
-    mqid = asset.get_marquee_id()
-    metric = "Sales per Share"
-
-    _logger.debug('where assetId=%s, metric=%s, period=%s, periodDirection=%s', mqid, metric, period, period_direction)
-
-    q = GsDataApi.build_market_data_query(
-        [mqid],
-        QueryType.FUNDAMENTAL_METRIC,
-        where=dict(metric=metric, period=period, periodDirection=period_direction.value),
-        source=source,
-        real_time=real_time
-    )
-
-    q['queries'][0]['vendor'] = 'Goldman Sachs'
-    _logger.debug('q %s', q)
-    df = _market_data_timed(q)
-    return _extract_series_from_df(df, QueryType.FUNDAMENTAL_METRIC)
+    return _fundamental_metric(asset, "Sales per Share", period, period_direction,
+                               'sales_per_share', source=source, real_time=real_time)
 
 
 @plot_measure((AssetClass.Commod, AssetClass.Equity, AssetClass.FX), None, [QueryType.SPOT])
@@ -2407,17 +2286,12 @@ def esg_aggregate(asset: Asset, metric: EsgMetric, value_unit: Optional[EsgValue
     if real_time:
         raise NotImplementedError('real-time esg-aggregate not implemented')
 
-    if metric != EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE and value_unit is None:
+    query_metric = _ESG_FIELDS.get((metric, value_unit))
+    if query_metric is None:
         raise MqValueError("value_unit is required for metric {m}".format(m=metric.value))
 
     mqid = asset.get_marquee_id()
-    if metric == EsgMetric.ENVIRONMENTAL_SOCIAL_DISCLOSURE:
-        query_metric = inflection.camelize(metric.value, False)
-    else:
-        query_metric = "{metric}{unit}".format(metric=inflection.camelize(metric.value, False),
-                                               unit=value_unit.value.capitalize())
-
-    query_type = ESG_METRIC_TO_QUERY_TYPE.get(query_metric)
+    query_type = ESG_METRIC_TO_QUERY_TYPE[query_metric]
     _logger.debug('where assetId=%s, metric=%s, value_unit=%s, query_type=%s',
                   mqid, metric.value, value_unit.value if value_unit is not None else None, query_type.value)
     q = GsDataApi.build_market_data_query([mqid], query_type, source=source, real_time=real_time)
@@ -76,9 +76,10 @@ setuptools.setup(
     extras_require={
         "internal": ["gs_quant_internal>=0.4.1", "requests_kerberos"],
         "notebook": ["jupyter", "matplotlib~=2.1.0", "pprint"],
-        "test": ["pytest", "pytest-cov", "pytest-mock", "testfixtures", "nbconvert", "nbformat", "jupyter_client"],
+        "test": ["pytest", "pytest-cov", "pytest-mock", "pytest-xdist", "testfixtures", "nbconvert", "nbformat",
+                 "jupyter_client"],
         "develop": ["wheel", "sphinx", "sphinx_rtd_theme", "sphinx_autodoc_typehints", "pytest", "pytest-cov",
-                    "pytest-mock", "testfixtures"]
+                    "pytest-mock", "pytest-xdist", "testfixtures"]
     },
     classifiers=[
         "Programming Language :: Python :: 3",